@@ -35,7 +35,8 @@ export default function Humanizer({ isPremium }) {
     try {
       console.log('🤖 Processing with AI Humaniser...');
       
-      const result = await aiHumaniserService.humanizeText(text);
+      // Only a re-save of a document humanized before can reuse sentences
+      const result = await aiHumaniserService.humanizeText(text, { incremental: Boolean(humanizedText) });
       
       if (result.success) {
         setHumanizedText(result.humanizedText);
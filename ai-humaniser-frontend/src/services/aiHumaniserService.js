@@ -27,15 +27,17 @@ class AIHumaniserService {
   /**
    * Humanize AI-generated text using the main model
    * @param {string} text - The AI-generated text to humanize
+   * @param {Object} [options]
+   * @param {boolean} [options.incremental] - Only re-humanize sentences changed since the last request
    * @returns {Promise<Object>} - Humanized text and metadata
    */
-  async humanizeText(text) {
+  async humanizeText(text, { incremental = false } = {}) {
     try {
       const headers = await this.getAuthHeaders();
       const response = await fetch(`${this.baseURL}/api/humanize/text`, {
         method: 'POST',
         headers: headers,
-        body: JSON.stringify({ text }),
+        body: JSON.stringify({ text, incremental }),
       });
 
       if (response.status === 401) {
@@ -309,7 +311,7 @@ class AIHumaniserService {
 export const aiHumaniserService = new AIHumaniserService();
 
 // Export utility functions for direct use
-export const humanizeText = (text) => aiHumaniserService.humanizeText(text);
+export const humanizeText = (text, options) => aiHumaniserService.humanizeText(text, options);
 export const humanizeNumbers = (text) => aiHumaniserService.humanizeNumbers(text);
 export const humanizeComprehensive = (text) => aiHumaniserService.humanizeComprehensive(text);
 export const detectAI = (text) => aiHumaniserService.detectAI(text);
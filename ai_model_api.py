@@ -3,11 +3,15 @@ AI Model API Server
 Flask-based web API that wraps the standalone AI model for frontend integration
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, g
 from flask_cors import CORS
+import json
 import time
 import os
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from functools import wraps
 from supabase import create_client, Client
@@ -37,7 +41,12 @@ except ImportError as e:
         return f"{size} bytes"
 
 # Import functions from standalone_ai_model.py
-from standalone_ai_model import humanize_numbers_in_text, detect_ai_indicators, process_text_comprehensive
+from standalone_ai_model import run_pipeline, humanize_paragraphs, warm_up, TEXT_PIPELINE, PIPELINE_VERSION
+from result_cache import ResultCache, django_cache_backend
+from job_queue import JobStore
+from metrics import MetricsRegistry
+from pipeline import add_stage_timing_hook
+from humaniser.token_auth import TokenCache, TokenVerifier, InvalidToken, jwt
 
 # Initialize Supabase
 supabase_url = os.environ.get("SUPABASE_URL")
@@ -53,9 +62,196 @@ else:
         options={"jwt_secret": supabase_jwt_secret}
     )
 
+if jwt is None:
+    print("⚠️ Warning: PyJWT not installed; tokens will be validated by the Supabase auth server")
+
+def verify_token_remotely(token):
+    """Validate a token with the Supabase auth server and return its claims"""
+    user_response = supabase_client.auth.get_user(token)
+    if not user_response.user:
+        raise Exception("Invalid user token")
+    return {'sub': user_response.user.id, 'email': user_response.user.email}
+
+# Supabase access tokens are verified locally against the JWT secret; validated
+# tokens are cached so repeated requests skip verification entirely
+token_verifier = TokenVerifier(
+    supabase_jwt_secret,
+    remote_verify=verify_token_remotely,
+    audience=os.environ.get("SUPABASE_JWT_AUDIENCE", "authenticated") or None,
+    cache=TokenCache(
+        max_entries=int(os.environ.get("AI_API_TOKEN_CACHE_SIZE", 10000)),
+        ttl=int(os.environ.get("AI_API_TOKEN_CACHE_TTL", 300)),
+    ),
+)
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# Shared tier (Django's cache framework) for results, so every worker can reuse them
+shared_cache_backend = django_cache_backend() if os.environ.get("AI_API_SHARED_CACHE") else None
+shared_cache_timeout = int(os.environ.get("AI_API_SHARED_CACHE_TIMEOUT", 3600))
+
+# Result cache shared by the humanize and detect endpoints
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("AI_API_CACHE_SIZE", 1024)),
+    version=PIPELINE_VERSION,
+    shared_backend=shared_cache_backend,
+    shared_timeout=shared_cache_timeout,
+)
+
+# Per-sentence results for incremental mode. Kept apart from result_cache so
+# whole-document entries cannot evict a document's sentences between saves.
+# Without the shared tier a re-save only reuses sentences when it reaches the
+# worker that served the previous save
+sentence_cache = ResultCache(
+    max_entries=int(os.environ.get("AI_API_SENTENCE_CACHE_SIZE", 50000)),
+    version=PIPELINE_VERSION,
+    shared_backend=shared_cache_backend,
+    shared_timeout=shared_cache_timeout,
+)
+
+# Request and pipeline stage metrics for this process, served by /api/stats and /metrics
+metrics = MetricsRegistry()
+
+def record_stage_timing(name, seconds):
+    metrics.observe('pipeline_stage_duration_seconds', seconds, stage=name)
+
+add_stage_timing_hook(record_stage_timing)
+
+# Endpoints counted as processing work in /api/stats, and the feature each one provides
+FEATURE_ENDPOINTS = {
+    'humanize_text_endpoint': 'text_humanization',
+    'humanize_numbers_endpoint': 'number_formatting',
+    'humanize_comprehensive_endpoint': 'comprehensive_humanization',
+    'humanize_batch_endpoint': 'batch_humanization',
+    'humanize_stream_endpoint': 'streaming_humanization',
+    'submit_job_endpoint': 'background_jobs',
+    'detect_ai_endpoint': 'ai_detection',
+}
+
+@app.before_request
+def start_request_timer():
+    g.request_start_time = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and record its latency (time to response headers for streams)"""
+    endpoint = request.endpoint or 'unmatched'
+    elapsed = time.perf_counter() - g.get('request_start_time', time.perf_counter())
+    metrics.increment('http_requests_total', endpoint=endpoint, status=response.status_code)
+    if response.status_code >= 500:
+        metrics.increment('http_request_errors_total', endpoint=endpoint)
+    metrics.observe('http_request_duration_seconds', elapsed, endpoint=endpoint)
+    return response
+
+# Model warm-up: runs at import so that, with gunicorn's preload_app, the
+# corpora are loaded once in the master and shared by the forked workers.
+# Set AI_API_WARMUP=background to warm up in a thread instead (development
+# server), or AI_API_WARMUP=off to skip it.
+model_ready = threading.Event()
+warm_up_status = {'time': None, 'error': None}
+
+def run_warm_up():
+    """Warm up the model and mark the API as ready (left not ready if warm-up fails)"""
+    try:
+        warm_up_status['time'] = round(warm_up(), 3)
+    except Exception as e:
+        warm_up_status['error'] = str(e)
+        print(f"⚠️ Warning: Model warm-up failed: {e}")
+        return
+    print(f"🔥 Model warmed up in {warm_up_status['time']} seconds")
+    model_ready.set()
+
+warm_up_mode = os.environ.get("AI_API_WARMUP", "preload")
+if warm_up_mode == "off":
+    model_ready.set()
+elif warm_up_mode == "background":
+    threading.Thread(target=run_warm_up, daemon=True).start()
+else:
+    run_warm_up()
+
+# Durable queue for large documents, processed by `python job_queue.py` workers
+job_store = JobStore()
+
+# Batch processing configuration
+BATCH_MAX_WORKERS = int(os.environ.get("AI_API_BATCH_WORKERS", os.cpu_count() or 1))
+BATCH_MAX_ITEMS = int(os.environ.get("AI_API_BATCH_MAX_ITEMS", 100))
+
+# Shared process pool for batch requests, created on first use
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+def get_batch_pool():
+    """Return the shared batch process pool, creating it if needed"""
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            _batch_pool = ProcessPoolExecutor(max_workers=BATCH_MAX_WORKERS)
+        return _batch_pool
+
+def reset_batch_pool(pool):
+    """Discard a broken batch pool so the next request starts a fresh one"""
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is pool:
+            _batch_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def submit_to_batch_pool(fn, *args):
+    """
+    Submit work to the batch pool and return (pool, future)
+
+    A pool whose worker died (or that another request has just shut down)
+    rejects new work, so it is replaced and the submit retried once.
+    """
+    pool = get_batch_pool()
+    try:
+        return pool, pool.submit(fn, *args)
+    except (BrokenProcessPool, RuntimeError):
+        reset_batch_pool(pool)
+        pool = get_batch_pool()
+        return pool, pool.submit(fn, *args)
+
+def requested_skip_stages(data):
+    """Stages listed in a request's optional 'skip_stages'"""
+    skip_stages = data.get('skip_stages') or []
+    if not isinstance(skip_stages, list):
+        raise ValueError("skip_stages must be a list of stage names")
+    return tuple(skip_stages)
+
+def pipeline_cache_namespace(skip=(), only=None, incremental=False):
+    """Cache namespace for a pipeline run, so different stage selections never share entries"""
+    namespace = 'pipeline:' + '+'.join(TEXT_PIPELINE.select(skip, only))
+    return namespace + ':incremental' if incremental else namespace
+
+def run_cached_pipeline(text, incremental=False, skip=(), only=None):
+    """Run the selected pipeline stages through the result cache.
+
+    AI detection and the word diff are lazy fields of the result, so
+    endpoints that do not read them never compute them.
+
+    In incremental mode unchanged sentences reuse their cached humanized
+    output, so an edited document only pays for the sentences that changed.
+    """
+    return result_cache.get_or_compute(
+        pipeline_cache_namespace(skip, only, incremental), text,
+        lambda t: run_pipeline(t, sentence_cache=sentence_cache if incremental else None, skip=skip, only=only)
+    )
+
+def describe_change(changed, unchanged='Minor'):
+    return 'Significant' if changed else unchanged
+
+def comprehensive_summary(text, result, processing_time):
+    """Build the response fields for a comprehensive humanization result"""
+    changes = result['changes']
+    return {
+        'humanized_text': result['final_text'],
+        'processing_time': round(processing_time, 3),
+        'text_changes': describe_change(changes.get('humanize')),
+        'number_changes': describe_change(changes.get('numbers'), unchanged='None'),
+        'total_changes': describe_change(any(changes.values())),
+    }
+
 # Decorator for token validation
 def token_required(f):
     @wraps(f)
@@ -67,29 +263,50 @@ def token_required(f):
         token = None
         if 'Authorization' in request.headers:
             # Extract token from "Bearer <token>"
-            token = request.headers['Authorization'].split(" ")[1]
+            parts = request.headers['Authorization'].split()
+            if len(parts) == 2 and parts[0].lower() == 'bearer':
+                token = parts[1]
 
         if not token:
             return jsonify({'error': 'Token is missing'}), 401
         try:
-            # Validate the token with Supabase
-            user_response = supabase_client.auth.get_user(token)
-            if not user_response.user:
-                 raise Exception("Invalid user token")
-    except Exception as e:
+            g.token_claims, source = token_verifier.verify(token)
+        except InvalidToken as e:
+            metrics.increment('auth_token_validations_total', result='rejected')
             return jsonify({'error': f'Token is invalid or expired: {e}'}), 401
+        metrics.increment('auth_token_validations_total', result=source)
 
         return f(*args, **kwargs)
     return decorated
 
+def current_user_id():
+    """User id ('sub') of the request's verified token, or None when auth is disabled"""
+    return g.get('token_claims', {}).get('sub')
+
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (reports ready only once the model is warmed up)"""
+    if warm_up_status['error'] is not None:
+        return jsonify({
+            'status': 'unhealthy',
+            'timestamp': datetime.now().isoformat(),
+            'version': '1.0.0',
+            'warm_up': warm_up_status
+        }), 503
+
+    if not model_ready.is_set():
         return jsonify({
+            'status': 'warming_up',
+            'timestamp': datetime.now().isoformat(),
+            'version': '1.0.0'
+        }), 503
+
+    return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'version': '1.0.0',
+        'warm_up': warm_up_status,
         'services': {
             'ai_model': 'available',
             'text_humanization': 'available',
@@ -97,6 +314,7 @@ def health_check():
             'number_formatting': 'available'
         }
     })
+
 @app.route('/api/humanize/text', methods=['POST'])
 @token_required
 def humanize_text_endpoint():
@@ -108,20 +326,29 @@ def humanize_text_endpoint():
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
+        try:
+            skip = requested_skip_stages(data)
+            pipeline_cache_namespace(skip)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'success': False}), 400
+
         start_time = time.time()
         
         # Process text using the standalone model
-        result = process_text_comprehensive(text)
+        result = run_cached_pipeline(text, incremental=bool(data.get('incremental')), skip=skip)
         
         processing_time = time.time() - start_time
         
-        return jsonify({
+        response = {
             'humanized_text': result['final_text'],
             'processing_time': round(processing_time, 3),
-            'word_count': len(text.split()),
-            'changes_made': 'Significant' if text != result['final_text' else 'Minor',
+            'word_count': result['word_count'],
+            'changes_made': describe_change(any(result['changes'].values())),
             'success': True
-        })
+        }
+        if 'incremental' in result:
+            response['incremental'] = result['incremental']
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({
@@ -142,13 +369,13 @@ def humanize_numbers_endpoint():
         
         start_time = time.time()
 
-        # Humanize numbers
-        humanized_text = humanize_numbers_in_text(text)
+        # Humanize numbers (only the number formatting stage runs)
+        result = run_cached_pipeline(text, skip=(), only=('numbers',))
 
         processing_time = time.time() - start_time
         return jsonify({
-            'humanized_text': humanized_text,
-            'numbers_processed': text != humanized_text,
+            'humanized_text': result['final_text'],
+            'numbers_processed': result['changes'].get('numbers', False),
             'processing_time': round(processing_time, 3),
             'success': True
         })
@@ -170,21 +397,230 @@ def humanize_comprehensive_endpoint():
         if not text:
             return jsonify({'error': 'Text is required'}), 400
 
+        try:
+            skip = requested_skip_stages(data)
+            pipeline_cache_namespace(skip)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'success': False}), 400
+
         start_time = time.time()
 
         # Process text comprehensively
-        result = process_text_comprehensive(text)
+        result = run_cached_pipeline(text, incremental=bool(data.get('incremental')), skip=skip)
 
         processing_time = time.time() - start_time
-    return jsonify({
-            'humanized_text': result['final_text'],
+        response = {
+            **comprehensive_summary(text, result, processing_time),
+            'stage_timings': {name: round(seconds, 3) for name, seconds in result['stage_timings'].items()},
+            'success': True
+        }
+        if data.get('include_diff'):
+            response['diff'] = result.get('diff', [])
+        return jsonify(response)
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@app.route('/api/humanize/batch', methods=['POST'])
+@token_required
+def humanize_batch_endpoint():
+    """Comprehensive humanization for a list of texts, processed concurrently"""
+    try:
+        data = request.get_json()
+        texts = data.get('texts')
+
+        if not isinstance(texts, list) or not texts:
+            return jsonify({'error': 'A non-empty list of texts is required'}), 400
+
+        if len(texts) > BATCH_MAX_ITEMS:
+            return jsonify({'error': f'Batch size exceeds the limit of {BATCH_MAX_ITEMS} texts'}), 400
+
+        start_time = time.time()
+        results = [None] * len(texts)
+        futures = {}
+        namespace = pipeline_cache_namespace()
+
+        for index, text in enumerate(texts):
+            if not isinstance(text, str) or not text:
+                results[index] = {'index': index, 'error': 'Text is required', 'success': False}
+                continue
+            cached = result_cache.get(namespace, text)
+            if cached is not None:
+                results[index] = {'index': index, **comprehensive_summary(text, cached, 0.0), 'success': True}
+                continue
+            try:
+                pool, future = submit_to_batch_pool(run_pipeline, text)
+            except (BrokenProcessPool, RuntimeError) as e:
+                results[index] = {'index': index, 'error': f'Worker process failed: {e}', 'success': False}
+                continue
+            futures[index] = (pool, future, time.time())
+
+        for index, (pool, future, submitted_at) in futures.items():
+            try:
+                result = future.result()
+                # Stages ran in a worker process, so record their timings here
+                for name in result['stages']:
+                    record_stage_timing(name, result['stage_timings'][name])
+                result_cache.set(namespace, texts[index], result)
+                processing_time = time.time() - submitted_at
+                results[index] = {'index': index, **comprehensive_summary(texts[index], result, processing_time), 'success': True}
+            except BrokenProcessPool as e:
+                reset_batch_pool(pool)
+                results[index] = {'index': index, 'error': f'Worker process failed: {e}', 'success': False}
+            except Exception as e:
+                results[index] = {'index': index, 'error': str(e), 'success': False}
+
+        processing_time = time.time() - start_time
+        succeeded = sum(1 for item in results if item['success'])
+        return jsonify({
+            'results': results,
+            'total_items': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
             'processing_time': round(processing_time, 3),
-            'text_changes': 'Significant' if text != result['humanized_text'] else 'Minor',
-            'number_changes': 'Significant' if result['humanized_text'] != result['final_text'] else 'None',
-            'total_changes': 'Significant' if text != result['final_text'] else 'Minor',
+            'success': True
+        })
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+def sse_event(event, payload):
+    """Format a server-sent event frame"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def generate_humanized_stream(text):
+    """Yield one SSE frame per humanized paragraph, then a summary frame"""
+    start_time = time.time()
+    first_chunk_time = None
+    humanized_chunks = []
+
+    try:
+        for index, humanized, separator in humanize_paragraphs(text, paragraph_cache=result_cache):
+            if first_chunk_time is None:
+                first_chunk_time = time.time() - start_time
+            humanized_chunks.append(humanized + separator)
+            yield sse_event('chunk', {
+                'index': index,
+                'text': humanized,
+                'separator': separator
+            })
+    except Exception as e:
+        yield sse_event('error', {'error': str(e), 'success': False})
+        return
+
+    final_text = ''.join(humanized_chunks)
+    yield sse_event('summary', {
+        'paragraphs': len(humanized_chunks),
+        'processing_time': round(time.time() - start_time, 3),
+        'time_to_first_chunk': round(first_chunk_time or 0.0, 3),
+        'word_count': len(text.split()),
+        'original_length': len(text),
+        'final_length': len(final_text),
+        'changes_made': 'Significant' if text != final_text else 'Minor',
         'success': True
     })
 
+@app.route('/api/humanize/stream', methods=['POST'])
+@token_required
+def humanize_stream_endpoint():
+    """Humanize text paragraph by paragraph, streaming each chunk as server-sent events"""
+    try:
+        data = request.get_json()
+        text = data.get('text', '')
+
+        if not text:
+            return jsonify({'error': 'Text is required'}), 400
+
+        return Response(
+            stream_with_context(generate_humanized_stream(text)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@app.route('/api/jobs', methods=['POST'])
+@token_required
+def submit_job_endpoint():
+    """Queue a large text for background humanization"""
+    try:
+        data = request.get_json()
+        text = data.get('text', '')
+
+        if not text:
+            return jsonify({'error': 'Text is required'}), 400
+
+        job_id = job_store.submit(text, owner=current_user_id())
+        return jsonify({
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/api/jobs/{job_id}',
+            'result_url': f'/api/jobs/{job_id}/result',
+            'success': True
+        }), 202
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@token_required
+def job_status_endpoint(job_id):
+    """Poll the status of a queued job"""
+    try:
+        job = job_store.get(job_id, owner=current_user_id())
+        if job is None:
+            return jsonify({'error': 'Job not found', 'success': False}), 404
+        return jsonify({**job, 'success': True})
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+@token_required
+def job_result_endpoint(job_id):
+    """Fetch the result of a completed job"""
+    try:
+        owner = current_user_id()
+        completed = job_store.get_result(job_id, owner=owner)
+        if completed is None:
+            # Unknown, or not finished yet: report which from the job's status
+            job = job_store.get(job_id, owner=owner)
+            if job is None:
+                return jsonify({'error': 'Job not found', 'success': False}), 404
+            if job['status'] == 'failed':
+                return jsonify({'job_id': job_id, 'status': 'failed', 'error': job['error'], 'success': False}), 500
+            return jsonify({
+                'job_id': job_id,
+                'status': job['status'],
+                'error': 'Job is not finished yet',
+                'success': False
+            }), 409
+
+        text, result = completed
+        return jsonify({
+            'job_id': job_id,
+            'status': 'completed',
+            **comprehensive_summary(text, result, result['processing_time']),
+            'word_count': result['word_count'],
+            'success': True
+        })
+
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -203,7 +639,9 @@ def detect_ai_endpoint():
             return jsonify({'error': 'Text is required'}), 400
 
         # Detect AI indicators
-        ai_result = detect_ai_indicators(text)
+        ai_result = result_cache.get_or_compute(
+            'detect', text, lambda t: run_pipeline(t, only=('detect',))['ai_detection']
+        )
 
         return jsonify({
             'is_ai_generated': ai_result['is_ai_generated'],
@@ -222,14 +660,61 @@ def detect_ai_endpoint():
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get processing statistics"""
+    counters = metrics.counters()
+    histograms = metrics.histograms()
+
+    requests_by_endpoint = {}
+    processed = 0
+    errors = 0
+    for (name, labels), value in counters.items():
+        labels = dict(labels)
+        if name == 'http_requests_total':
+            requests_by_endpoint[labels['endpoint']] = requests_by_endpoint.get(labels['endpoint'], 0) + value
+            if labels['endpoint'] in FEATURE_ENDPOINTS and labels['status'] < 400:
+                processed += value
+        elif name == 'http_request_errors_total' and labels['endpoint'] in FEATURE_ENDPOINTS:
+            errors += value
+
+    endpoints = {}
+    stages = {}
+    feature_requests = 0
+    feature_time = 0.0
+    for (name, labels), histogram in histograms.items():
+        labels = dict(labels)
+        if name == 'http_request_duration_seconds':
+            endpoint = labels['endpoint']
+            endpoints[endpoint] = {
+                'errors': counters.get(('http_request_errors_total', (('endpoint', endpoint),)), 0),
+                **histogram.summary()
+            }
+            if endpoint in FEATURE_ENDPOINTS:
+                feature_requests += histogram.count
+                feature_time += histogram.sum
+        elif name == 'pipeline_stage_duration_seconds':
+            stages[labels['stage']] = histogram.summary()
+
+    popular = sorted(
+        (endpoint for endpoint in requests_by_endpoint if endpoint in FEATURE_ENDPOINTS),
+        key=lambda endpoint: -requests_by_endpoint[endpoint]
+    )
     return jsonify({
-        'total_processed': 0,  # You can implement a counter if needed
-        'average_processing_time': 0.5,
-        'success_rate': 100.0,
-        'popular_features': ['text_humanization', 'ai_detection',
+        'total_processed': processed,
+        'average_processing_time': round(feature_time / feature_requests, 3) if feature_requests else 0.0,
+        'success_rate': round(100.0 * (feature_requests - errors) / feature_requests, 2) if feature_requests else 100.0,
+        'popular_features': [FEATURE_ENDPOINTS[endpoint] for endpoint in popular],
+        'endpoints': endpoints,
+        'stages': stages,
+        'uptime': round(time.time() - metrics.started_at, 3),
+        'cache': result_cache.stats(),
+        'sentence_cache': sentence_cache.stats(),
         'success': True
     })
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Metrics in the Prometheus text exposition format"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     print("🚀 Starting AI Model API Server...")
     print("📍 Server will run on http://localhost:5000")
@@ -237,10 +722,15 @@ if __name__ == '__main__':
     print("   - POST /api/humanize/text")
     print("   - POST /api/humanize/numbers") 
     print("   - POST /api/humanize/comprehensive")
+    print("   - POST /api/humanize/batch")
+    print("   - POST /api/humanize/stream")
+    print("   - POST /api/jobs")
+    print("   - GET  /api/jobs/<job_id>")
+    print("   - GET  /api/jobs/<job_id>/result")
     print("   - POST /api/detect/ai")
     print("   - GET  /api/health")
     print("   - GET  /api/stats")
+    print("   - GET  /metrics")
     print("=" * 50)
     
     app.run(host='0.0.0.0', port=5000, debug=True) 
-```
@@ -35,6 +35,43 @@ ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_ANON_KEY = os.getenv('SUPABASE_ANON_KEY')
 SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+# Used to verify access tokens locally (Project Settings > API > JWT Secret)
+SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET')
+SUPABASE_JWT_AUDIENCE = os.getenv('SUPABASE_JWT_AUDIENCE', 'authenticated')
+# Upper bound, in seconds, on how long a verified user is cached (never past token expiry)
+SUPABASE_USER_CACHE_TTL = int(os.getenv('SUPABASE_USER_CACHE_TTL', '300'))
+# Pooled HTTP transport for Supabase table operations
+SUPABASE_HTTP_POOL_SIZE = int(os.getenv('SUPABASE_HTTP_POOL_SIZE', '10'))
+SUPABASE_HTTP_CONNECT_TIMEOUT = float(os.getenv('SUPABASE_HTTP_CONNECT_TIMEOUT', '3.05'))
+SUPABASE_HTTP_READ_TIMEOUT = float(os.getenv('SUPABASE_HTTP_READ_TIMEOUT', '10'))
+SUPABASE_HTTP_RETRIES = int(os.getenv('SUPABASE_HTTP_RETRIES', '3'))
+SUPABASE_HTTP_BACKOFF = float(os.getenv('SUPABASE_HTTP_BACKOFF', '0.3'))
+# Bulk insert/upsert/delete: rows per request and concurrent requests (keep <= pool size)
+SUPABASE_BULK_CHUNK_SIZE = int(os.getenv('SUPABASE_BULK_CHUNK_SIZE', '500'))
+SUPABASE_BULK_CONCURRENCY = int(os.getenv('SUPABASE_BULK_CONCURRENCY', '4'))
+# Read-through cache for get_data: per-table TTLs in seconds, e.g. "plans=3600,profiles=60".
+# Tables not listed use the default TTL (0 = not cached). Writes and realtime changes
+# invalidate a table's entries; use a shared cache backend to invalidate across workers.
+SUPABASE_QUERY_CACHE_TTLS = {
+    table.strip(): int(ttl)
+    for table, _, ttl in (item.partition('=') for item in os.getenv('SUPABASE_QUERY_CACHE_TTLS', '').split(','))
+    if table.strip()
+}
+SUPABASE_QUERY_CACHE_DEFAULT_TTL = int(os.getenv('SUPABASE_QUERY_CACHE_DEFAULT_TTL', '0'))
+
+# Subscription usage metering: 'off' writes every increment atomically, 'memory' or
+# 'cache' buffer increments (per process / shared through the cache) and write them in bulk
+USAGE_METERING_BUFFER = os.getenv('USAGE_METERING_BUFFER', 'off')
+USAGE_METERING_FLUSH_INTERVAL = float(os.getenv('USAGE_METERING_FLUSH_INTERVAL', '5'))
+# UsageLog records are buffered in memory (at most USAGE_LOG_BUFFER_SIZE) and bulk
+# inserted USAGE_LOG_BATCH_SIZE at a time, at least every USAGE_LOG_FLUSH_INTERVAL seconds
+USAGE_LOG_BUFFER_SIZE = int(os.getenv('USAGE_LOG_BUFFER_SIZE', '10000'))
+USAGE_LOG_BATCH_SIZE = int(os.getenv('USAGE_LOG_BATCH_SIZE', '500'))
+USAGE_LOG_FLUSH_INTERVAL = float(os.getenv('USAGE_LOG_FLUSH_INTERVAL', '2'))
+
+# The compact_usage job folds UsageLog rows older than USAGE_ROLLUP_LAG seconds
+# into the hourly/daily usage rollups; run it every few minutes (e.g. from cron)
+USAGE_ROLLUP_LAG = int(os.getenv('USAGE_ROLLUP_LAG', '120'))
 
 # Application definition
 
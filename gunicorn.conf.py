@@ -0,0 +1,14 @@
+"""
+Gunicorn configuration for the AI Model API
+The app (and the warmed-up model) is loaded once in the master process and
+shared copy-on-write by the forked workers
+"""
+
+import os
+
+bind = os.environ.get("AI_API_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("AI_API_WORKERS", 2))
+timeout = int(os.environ.get("AI_API_TIMEOUT", 120))
+
+# Import ai_model_api (which warms up the model) before forking workers
+preload_app = True
@@ -18,6 +18,7 @@ from django.middleware.csrf import get_token
 import json
 
 from .supabase_service import supabase_service
+from .usage_logging import usage_log_writer
 
 logger = logging.getLogger(__name__)
 
@@ -289,5 +290,7 @@ def health_check(request):
         'status': 'healthy',
         'django': True,
         'supabase': supabase_status,
+        'supabase_http': supabase_service.transport_stats(),
+        'usage_log': usage_log_writer.stats(),
         'timestamp': '2024-01-01T00:00:00Z'  # You can use timezone.now() here
     }) 
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Periodic Flushers - base class for buffers written to the database by a background thread
+"""
+import os
+import threading
+import logging
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+class PeriodicFlusher:
+    """
+    Runs flush() on a daemon thread every flush_interval seconds, or sooner
+    when wake() is called, and once more on stop().
+
+    Threads do not survive fork, so the thread is started lazily by
+    _ensure_thread() and restarted in each worker process.
+    """
+
+    thread_name = "periodic-flusher"
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._thread_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._pid = None
+
+    def flush(self):
+        raise NotImplementedError
+
+    def wake(self):
+        """Flush now instead of at the end of the current interval"""
+        self._wake.set()
+
+    def _thread_running(self) -> bool:
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def _ensure_thread(self):
+        if self._thread_running():
+            return
+        with self._thread_lock:
+            if self._thread_running():
+                return
+            self._pid = os.getpid()
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"{self.thread_name} flush failed: {e}")
+            finally:
+                close_old_connections()
+
+    def stop(self):
+        """Stop the background thread and flush what is left"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread_running():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
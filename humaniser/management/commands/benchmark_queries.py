@@ -0,0 +1,182 @@
+import random
+import statistics
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from humaniser.payment_models import Invoice, Payment, PaymentMethod, Plan, Subscription, UsageLog
+
+# Indexes and constraints added for the queries below, by model
+BENCHMARKED_INDEXES = {
+    Payment: ['payment_user_created_idx'],
+    Subscription: ['subscription_user_status_idx'],
+    Invoice: ['invoice_user_created_idx'],
+    PaymentMethod: ['payment_method_default_idx'],
+    UsageLog: ['usage_log_user_created_idx', 'usage_log_created_idx'],
+}
+
+class _Rollback(Exception):
+    pass
+
+@contextmanager
+def _explicit_created_at(*models):
+    """Let bulk_create keep the seeded created_at instead of auto_now_add's now()"""
+    fields = [model._meta.get_field('created_at') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+class Command(BaseCommand):
+    help = (
+        "Show plans and timings of the hot payment/subscription/usage queries "
+        "without and with their indexes. Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help="Users to seed (0 to use existing data)")
+        parser.add_argument('--rows', type=int, default=50, help="Payments and usage logs to seed per user")
+        parser.add_argument('--repeat', type=int, default=50, help="Runs per query for the timings")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['users']:
+                    self._seed(options['users'], options['rows'])
+                self._analyze()
+                user_id = self._sample_user()
+                if user_id is None:
+                    self.stdout.write(self.style.WARNING("⚠️ No users to benchmark"))
+                    raise _Rollback()
+
+                self._set_indexes(present=False)
+                self._analyze()
+                before = self._run(user_id, options['repeat'], "WITHOUT indexes")
+                self._set_indexes(present=True)
+                self._analyze()
+                after = self._run(user_id, options['repeat'], "WITH indexes")
+
+                self.stdout.write("\n📊 Median time per query (ms)")
+                for name in before:
+                    self.stdout.write(f"  {name:<28} {before[name]:>9.3f} -> {after[name]:>9.3f}")
+                raise _Rollback()
+        except _Rollback:
+            pass
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark finished, seeded data rolled back"))
+
+    def _queries(self, user_id):
+        now = timezone.now()
+        return {
+            'payment_history': lambda: Payment.objects.filter(user_id=user_id).order_by('-created_at')[:20],
+            'active_subscription': lambda: Subscription.objects.filter(
+                user_id=user_id, status='active'
+            ).order_by('-created_at')[:1],
+            'invoice_history': lambda: Invoice.objects.filter(user_id=user_id).order_by('-created_at')[:20],
+            'default_payment_method': lambda: PaymentMethod.objects.filter(user_id=user_id, is_default=True)[:1],
+            'usage_range': lambda: UsageLog.objects.filter(
+                user_id=user_id, created_at__gte=now - timedelta(days=7), created_at__lt=now
+            ),
+            'usage_compaction_window': lambda: UsageLog.objects.filter(
+                created_at__gte=now - timedelta(hours=1), created_at__lt=now
+            ).values('user_id', 'service_type'),
+        }
+
+    def _run(self, user_id, repeat, label):
+        self.stdout.write(f"\n🔍 Query plans {label}")
+        timings = {}
+        for name, build in self._queries(user_id).items():
+            self.stdout.write(f"\n-- {name}")
+            self.stdout.write(build().explain())
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(build())
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[name] = statistics.median(samples)
+        return timings
+
+    def _set_indexes(self, present):
+        # Only generate the SQL: the schema editor context cannot be entered
+        # inside a transaction on SQLite
+        editor = connection.schema_editor()
+        editor.deferred_sql = []
+        with connection.cursor() as cursor:
+            for model, names in BENCHMARKED_INDEXES.items():
+                for item in [*model._meta.indexes, *model._meta.constraints]:
+                    if item.name in names:
+                        sql = item.create_sql(model, editor) if present else item.remove_sql(model, editor)
+                        cursor.execute(str(sql))
+
+    def _analyze(self):
+        if connection.vendor in ('postgresql', 'sqlite'):
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+    def _sample_user(self):
+        return Subscription.objects.filter(status='active').values_list('user_id', flat=True).first() \
+            or User.objects.values_list('pk', flat=True).first()
+
+    def _seed(self, user_count, rows):
+        self.stdout.write(f"🌱 Seeding {user_count} users with {rows} payments and usage logs each...")
+        now = timezone.now()
+        run = uuid.uuid4().hex[:8]
+        plan = Plan.objects.create(name='Benchmark', slug=f'benchmark-{run}', price=10, max_requests_per_month=1000)
+        users = User.objects.bulk_create([
+            User(username=f'benchmark-{run}-{i}', email=f'benchmark-{run}-{i}@example.com')
+            for i in range(user_count)
+        ])
+        if not users[0].pk:
+            users = list(User.objects.filter(username__startswith=f'benchmark-{run}-'))
+
+        payments, subscriptions, invoices, methods, logs, created_at = [], [], [], [], [], []
+        for user in users:
+            for i in range(rows):
+                created_at.append(now - timedelta(days=random.uniform(0, 365)))
+                payments.append(Payment(
+                    user=user, plan=plan, amount=10, payment_method='stripe', status='completed',
+                    transaction_id=uuid.uuid4().hex, billing_email=user.email, billing_name=user.username
+                ))
+                logs.append(UsageLog(
+                    user=user, subscription_id=None, service_type=random.choice(['ai_humanizer', 'ai_detector']),
+                    characters_processed=random.randint(1, 5000)
+                ))
+            for i in range(12):
+                start = now - timedelta(days=30 * (i + 1))
+                subscriptions.append(Subscription(
+                    user=user, plan=plan, status='active' if i == 0 else 'expired',
+                    start_date=start, end_date=start + timedelta(days=30),
+                    current_period_start=start, current_period_end=start + timedelta(days=30)
+                ))
+            for i in range(3):
+                methods.append(PaymentMethod(user=user, type='card', external_id=uuid.uuid4().hex, is_default=i == 0))
+
+        for objects in (payments, logs):
+            for obj, timestamp in zip(objects, created_at):
+                obj.created_at = timestamp
+        with _explicit_created_at(Payment):
+            Payment.objects.bulk_create(payments, batch_size=1000)
+        Subscription.objects.bulk_create(subscriptions, batch_size=1000)
+        PaymentMethod.objects.bulk_create(methods, batch_size=1000)
+
+        active = dict(Subscription.objects.filter(plan=plan, status='active').values_list('user_id', 'pk'))
+        for log in logs:
+            log.subscription_id = active[log.user_id]
+        UsageLog.objects.bulk_create(logs, batch_size=1000)
+        for user in users:
+            for i in range(12):
+                invoices.append(Invoice(
+                    user=user, subscription_id=active[user.pk], invoice_number=uuid.uuid4().hex[:20],
+                    subtotal=10, total=10, invoice_date=now - timedelta(days=30 * i), due_date=now,
+                    billing_email=user.email, billing_name=user.username
+                ))
+        Invoice.objects.bulk_create(invoices, batch_size=1000)
+
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from humaniser.usage_rollups import DEFAULT_COMPACTION_LAG, compact_usage
+
+class Command(BaseCommand):
+    help = "Fold new UsageLog rows into the hourly and daily usage rollups"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lag', type=int, default=int(DEFAULT_COMPACTION_LAG.total_seconds()),
+            help="Leave rows younger than this many seconds for the next run"
+        )
+
+    def handle(self, *args, **options):
+        result = compact_usage(lag=timedelta(seconds=options['lag']))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Compacted usage up to {result['until']}: "
+            f"{result['hourly_rows']} hourly and {result['daily_rows']} daily rollups updated"
+        ))
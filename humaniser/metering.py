@@ -0,0 +1,228 @@
+"""
+Usage Metering - atomic, optionally buffered, subscription usage counters
+"""
+import atexit
+import threading
+import logging
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .flushers import PeriodicFlusher
+
+logger = logging.getLogger(__name__)
+
+class MemoryUsageBuffer:
+    """Pending increments held in this process"""
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def add(self, subscription_id, requests: int, characters: int):
+        with self._lock:
+            pending = self._pending.setdefault(subscription_id, [0, 0])
+            pending[0] += requests
+            pending[1] += characters
+
+    def pending(self, subscription_id) -> Tuple[int, int]:
+        with self._lock:
+            return tuple(self._pending.get(subscription_id, (0, 0)))
+
+    def take(self) -> Dict:
+        with self._lock:
+            taken, self._pending = self._pending, {}
+        return {subscription_id: tuple(counts) for subscription_id, counts in taken.items()}
+
+    def done(self, taken: Dict, success: bool):
+        if not success:
+            # Put the increments back so the next flush retries them
+            for subscription_id, (requests, characters) in taken.items():
+                self.add(subscription_id, requests, characters)
+
+class CacheUsageBuffer:
+    """
+    Pending increments held in the Django cache, shared by every process
+    using the same cache backend, so quota checks see other workers'
+    unflushed usage. Each process flushes the subscriptions it has touched.
+
+    Amounts are claimed before they are written: under a short
+    per-subscription cache lock the pending counters are read and
+    decremented by what was read, so two processes flushing the same
+    subscription never write the same increments twice. A failed write
+    adds the claimed amounts back.
+    """
+
+    def __init__(self, prefix: str = "metering:pending", lock_timeout: int = 30):
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _keys(self, subscription_id):
+        return f"{self.prefix}:{subscription_id}:requests", f"{self.prefix}:{subscription_id}:characters"
+
+    def _incr(self, key, amount):
+        if not amount:
+            return
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            # Evicted between add and incr
+            cache.add(key, amount, None)
+
+    def add(self, subscription_id, requests: int, characters: int):
+        requests_key, characters_key = self._keys(subscription_id)
+        self._incr(requests_key, requests)
+        self._incr(characters_key, characters)
+        with self._lock:
+            self._dirty.add(subscription_id)
+
+    def pending(self, subscription_id) -> Tuple[int, int]:
+        values = cache.get_many(self._keys(subscription_id))
+        return tuple(values.get(key, 0) for key in self._keys(subscription_id))
+
+    def _claim(self, subscription_id) -> Tuple[int, int]:
+        """Take the pending amounts out of the cache; None if another process holds the claim lock"""
+        lock_key = f"{self.prefix}:{subscription_id}:lock"
+        if not cache.add(lock_key, 1, self.lock_timeout):
+            return None
+        try:
+            counts = self.pending(subscription_id)
+            for key, amount in zip(self._keys(subscription_id), counts):
+                if amount:
+                    try:
+                        cache.decr(key, amount)
+                    except ValueError:
+                        pass
+            return counts
+        finally:
+            cache.delete(lock_key)
+
+    def take(self) -> Dict:
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        taken, busy = {}, set()
+        for subscription_id in dirty:
+            counts = self._claim(subscription_id)
+            if counts is None:
+                busy.add(subscription_id)
+            elif any(counts):
+                taken[subscription_id] = counts
+        if busy:
+            # Another process is claiming these right now; look again next flush
+            with self._lock:
+                self._dirty.update(busy)
+        return taken
+
+    def done(self, taken: Dict, success: bool):
+        if success:
+            return
+        # Put the claimed increments back so the next flush retries them
+        for subscription_id, (requests, characters) in taken.items():
+            self.add(subscription_id, requests, characters)
+
+class UsageMeter(PeriodicFlusher):
+    """
+    Records subscription usage without read-modify-write races.
+
+    Without a buffer every call is a single UPDATE ... SET col = col + n on
+    the two usage columns. With a buffer, increments accumulate and are
+    written for all touched subscriptions in one UPDATE (CASE ... WHEN)
+    by a background thread every flush_interval seconds, on flush(), and
+    at process exit. A process killed without running its exit handlers
+    loses at most the last flush_interval seconds of buffered usage.
+    """
+
+    thread_name = "usage-meter-flusher"
+
+    def __init__(self, buffer=None, flush_interval: float = 5.0):
+        super().__init__(flush_interval)
+        self.buffer = buffer
+        self._flush_lock = threading.Lock()
+
+    @property
+    def buffered(self) -> bool:
+        return self.buffer is not None
+
+    def record(self, subscription, characters: int, requests: int = 1):
+        """Add usage for a subscription"""
+        if self.buffer is None:
+            self._write({subscription.pk: (requests, characters)})
+            # Keep the caller's instance in step without reloading it
+            subscription.requests_used_this_month += requests
+            subscription.characters_used_this_month += characters
+            return
+
+        self.buffer.add(subscription.pk, requests, characters)
+        self._ensure_thread()
+
+    def pending(self, subscription) -> Tuple[int, int]:
+        """Usage recorded for a subscription but not yet written: (requests, characters)"""
+        if self.buffer is None:
+            return (0, 0)
+        return self.buffer.pending(subscription.pk)
+
+    def flush(self, blocking: bool = True) -> int:
+        """Write buffered usage to the database; returns the number of subscriptions updated"""
+        if self.buffer is None or not self._flush_lock.acquire(blocking=blocking):
+            return 0
+        try:
+            taken = self.buffer.take()
+            if not taken:
+                return 0
+            try:
+                self._write(taken)
+            except Exception as e:
+                logger.error(f"Failed to flush usage for {len(taken)} subscriptions: {e}")
+                self.buffer.done(taken, success=False)
+                return 0
+            self.buffer.done(taken, success=True)
+            logger.debug(f"Flushed usage for {len(taken)} subscriptions")
+            return len(taken)
+        finally:
+            self._flush_lock.release()
+
+    @staticmethod
+    def _write(increments: Dict):
+        """Apply {subscription_id: (requests, characters)} in one UPDATE touching only the usage columns"""
+        from .payment_models import Subscription
+
+        if len(increments) == 1:
+            (subscription_id, (requests, characters)), = increments.items()
+            Subscription.objects.filter(pk=subscription_id).update(
+                requests_used_this_month=F('requests_used_this_month') + requests,
+                characters_used_this_month=F('characters_used_this_month') + characters,
+                updated_at=timezone.now(),
+            )
+            return
+
+        def delta(index):
+            return Case(
+                *[When(pk=subscription_id, then=Value(counts[index])) for subscription_id, counts in increments.items()],
+                default=Value(0),
+                output_field=models.PositiveIntegerField(),
+            )
+
+        Subscription.objects.filter(pk__in=list(increments)).update(
+            requests_used_this_month=F('requests_used_this_month') + delta(0),
+            characters_used_this_month=F('characters_used_this_month') + delta(1),
+            updated_at=timezone.now(),
+        )
+
+def _build_meter() -> UsageMeter:
+    mode = getattr(settings, 'USAGE_METERING_BUFFER', 'off')
+    buffers = {'memory': MemoryUsageBuffer, 'cache': CacheUsageBuffer}
+    if mode not in buffers:
+        return UsageMeter()
+    meter = UsageMeter(buffers[mode](), flush_interval=getattr(settings, 'USAGE_METERING_FLUSH_INTERVAL', 5.0))
+    atexit.register(meter.stop)
+    return meter
+
+# Global instance
+usage_meter = _build_meter()
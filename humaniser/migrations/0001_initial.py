@@ -0,0 +1,236 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:48
+
+import datetime
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Plan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(unique=True)),
+                ('plan_type', models.CharField(choices=[('free', 'Free'), ('basic', 'Basic'), ('pro', 'Professional'), ('enterprise', 'Enterprise')], default='basic', max_length=20)),
+                ('billing_cycle', models.CharField(choices=[('monthly', 'Monthly'), ('yearly', 'Yearly'), ('lifetime', 'Lifetime')], default='monthly', max_length=20)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))])),
+                ('currency', models.CharField(default='USD', max_length=3)),
+                ('trial_days', models.PositiveIntegerField(default=0)),
+                ('max_requests_per_month', models.PositiveIntegerField(default=100)),
+                ('max_characters_per_request', models.PositiveIntegerField(default=1000)),
+                ('ai_detection_enabled', models.BooleanField(default=False)),
+                ('plagiarism_check_enabled', models.BooleanField(default=False)),
+                ('priority_support', models.BooleanField(default=False)),
+                ('api_access', models.BooleanField(default=False)),
+                ('team_collaboration', models.BooleanField(default=False)),
+                ('custom_templates', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_popular', models.BooleanField(default=False)),
+                ('description', models.TextField(blank=True)),
+                ('features', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Plan',
+                'verbose_name_plural': 'Plans',
+                'ordering': ['price'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UsageRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('compacted_until', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PaymentMethod',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('type', models.CharField(choices=[('card', 'Credit Card'), ('bank_account', 'Bank Account'), ('paypal', 'PayPal'), ('apple_pay', 'Apple Pay'), ('google_pay', 'Google Pay')], max_length=20)),
+                ('external_id', models.CharField(max_length=255, unique=True)),
+                ('card_brand', models.CharField(blank=True, max_length=20)),
+                ('card_last4', models.CharField(blank=True, max_length=4)),
+                ('card_exp_month', models.PositiveIntegerField(blank=True, null=True)),
+                ('card_exp_year', models.PositiveIntegerField(blank=True, null=True)),
+                ('bank_name', models.CharField(blank=True, max_length=100)),
+                ('bank_last4', models.CharField(blank=True, max_length=4)),
+                ('bank_routing_number', models.CharField(blank=True, max_length=20)),
+                ('is_default', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payment_methods', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Payment Method',
+                'verbose_name_plural': 'Payment Methods',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Payment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('currency', models.CharField(default='USD', max_length=3)),
+                ('payment_method', models.CharField(choices=[('stripe', 'Stripe'), ('paypal', 'PayPal'), ('apple_pay', 'Apple Pay'), ('google_pay', 'Google Pay'), ('square', 'Square')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled'), ('refunded', 'Refunded')], default='pending', max_length=20)),
+                ('transaction_id', models.CharField(max_length=255, unique=True)),
+                ('gateway_response', models.JSONField(blank=True, default=dict)),
+                ('billing_email', models.EmailField(max_length=254)),
+                ('billing_name', models.CharField(max_length=255)),
+                ('billing_address', models.TextField(blank=True)),
+                ('billing_city', models.CharField(blank=True, max_length=100)),
+                ('billing_state', models.CharField(blank=True, max_length=100)),
+                ('billing_country', models.CharField(blank=True, max_length=100)),
+                ('billing_postal_code', models.CharField(blank=True, max_length=20)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to=settings.AUTH_USER_MODEL)),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='humaniser.plan')),
+            ],
+            options={
+                'verbose_name': 'Payment',
+                'verbose_name_plural': 'Payments',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Subscription',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('cancelled', 'Cancelled'), ('expired', 'Expired'), ('past_due', 'Past Due'), ('unpaid', 'Unpaid'), ('trialing', 'Trialing')], default='active', max_length=20)),
+                ('start_date', models.DateTimeField()),
+                ('end_date', models.DateTimeField()),
+                ('trial_end_date', models.DateTimeField(blank=True, null=True)),
+                ('cancelled_at', models.DateTimeField(blank=True, null=True)),
+                ('external_id', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('current_period_start', models.DateTimeField()),
+                ('current_period_end', models.DateTimeField()),
+                ('cancel_at_period_end', models.BooleanField(default=False)),
+                ('requests_used_this_month', models.PositiveIntegerField(default=0)),
+                ('characters_used_this_month', models.PositiveIntegerField(default=0)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('payment', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='humaniser.payment')),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subscriptions', to='humaniser.plan')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subscriptions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Subscription',
+                'verbose_name_plural': 'Subscriptions',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Invoice',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('invoice_number', models.CharField(max_length=50, unique=True)),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('open', 'Open'), ('paid', 'Paid'), ('uncollectible', 'Uncollectible'), ('void', 'Void')], default='draft', max_length=20)),
+                ('subtotal', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('tax', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10)),
+                ('total', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('currency', models.CharField(default='USD', max_length=3)),
+                ('invoice_date', models.DateTimeField()),
+                ('due_date', models.DateTimeField()),
+                ('paid_date', models.DateTimeField(blank=True, null=True)),
+                ('billing_email', models.EmailField(max_length=254)),
+                ('billing_name', models.CharField(max_length=255)),
+                ('billing_address', models.TextField(blank=True)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='invoices', to=settings.AUTH_USER_MODEL)),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='invoices', to='humaniser.subscription')),
+            ],
+            options={
+                'verbose_name': 'Invoice',
+                'verbose_name_plural': 'Invoices',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UsageLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('service_type', models.CharField(max_length=50)),
+                ('characters_processed', models.PositiveIntegerField()),
+                ('processing_time', models.DurationField(blank=True, null=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('user_agent', models.TextField(blank=True)),
+                ('success', models.BooleanField(default=True)),
+                ('error_message', models.TextField(blank=True)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_logs', to='humaniser.subscription')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Usage Log',
+                'verbose_name_plural': 'Usage Logs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UsageDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service_type', models.CharField(max_length=50)),
+                ('day', models.DateField()),
+                ('request_count', models.PositiveIntegerField(default=0)),
+                ('success_count', models.PositiveIntegerField(default=0)),
+                ('characters_processed', models.PositiveBigIntegerField(default=0)),
+                ('processing_time', models.DurationField(default=datetime.timedelta)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily Usage Rollup',
+                'verbose_name_plural': 'Daily Usage Rollups',
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'day', 'service_type'), name='usage_daily_rollup_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UsageHourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service_type', models.CharField(max_length=50)),
+                ('period_start', models.DateTimeField()),
+                ('request_count', models.PositiveIntegerField(default=0)),
+                ('success_count', models.PositiveIntegerField(default=0)),
+                ('characters_processed', models.PositiveBigIntegerField(default=0)),
+                ('processing_time', models.DurationField(default=datetime.timedelta)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_hourly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Hourly Usage Rollup',
+                'verbose_name_plural': 'Hourly Usage Rollups',
+                'ordering': ['-period_start'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'period_start', 'service_type'), name='usage_hourly_rollup_unique')],
+            },
+        ),
+    ]
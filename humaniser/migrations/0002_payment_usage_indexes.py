@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humaniser', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['user', '-created_at'], name='invoice_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['user', '-created_at'], name='payment_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentmethod',
+            index=models.Index(condition=models.Q(('is_default', True)), fields=['user'], name='payment_method_default_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['user', 'status', '-created_at'], name='subscription_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usagelog',
+            index=models.Index(fields=['user', 'created_at'], name='usage_log_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usagelog',
+            index=models.Index(fields=['created_at'], name='usage_log_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:24
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humaniser', '0002_payment_usage_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usagelog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
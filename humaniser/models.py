@@ -1,3 +1,9 @@
 from django.db import models
 
 # Create your models here.
+
+# Register the payment and usage models with the app
+from .payment_models import (  # noqa: F401
+    Plan, Payment, Subscription, Invoice, PaymentMethod, UsageLog,
+    UsageHourlyRollup, UsageDailyRollup, UsageRollupState,
+)
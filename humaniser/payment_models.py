@@ -6,6 +6,7 @@ Defines Payment, Subscription, Plan, and related models
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from decimal import Decimal
 import uuid
 from datetime import timedelta
@@ -135,6 +136,10 @@ class Payment(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
+        indexes = [
+            # Payment history: a user's payments, newest first
+            models.Index(fields=['user', '-created_at'], name='payment_user_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - ${self.amount} {self.currency} - {self.status}"
@@ -152,7 +157,7 @@ class Payment(models.Model):
         from django.utils import timezone
         self.status = 'completed'
         self.completed_at = timezone.now()
-        self.save()
+        self.save(update_fields=['status', 'completed_at', 'updated_at'])
 
 class Subscription(models.Model):
     """Subscription model for user subscriptions"""
@@ -202,6 +207,10 @@ class Subscription(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Subscription'
         verbose_name_plural = 'Subscriptions'
+        indexes = [
+            # A user's subscriptions by status (e.g. the active one), newest first
+            models.Index(fields=['user', 'status', '-created_at'], name='subscription_user_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.plan.name} - {self.status}"
@@ -238,20 +247,21 @@ class Subscription(models.Model):
     
     @property
     def can_make_request(self):
-        """Check if user can make a request based on plan limits"""
+        """Check if user can make a request based on plan limits (including unflushed usage)"""
         if self.is_trialing:
             return True
         
         if not self.is_active:
             return False
         
-        return self.requests_used_this_month < self.plan.max_requests_per_month
+        from .metering import usage_meter
+        pending_requests, _ = usage_meter.pending(self)
+        return self.requests_used_this_month + pending_requests < self.plan.max_requests_per_month
     
     def increment_usage(self, characters_used):
-        """Increment usage counters"""
-        self.requests_used_this_month += 1
-        self.characters_used_this_month += characters_used
-        self.save()
+        """Increment usage counters atomically, without saving the rest of the row"""
+        from .metering import usage_meter
+        usage_meter.record(self, characters_used)
     
     def cancel(self):
         """Cancel subscription"""
@@ -259,13 +269,14 @@ class Subscription(models.Model):
         self.status = 'cancelled'
         self.cancelled_at = timezone.now()
         self.cancel_at_period_end = True
-        self.save()
+        # Only the changed columns, so usage increments written meanwhile are kept
+        self.save(update_fields=['status', 'cancelled_at', 'cancel_at_period_end', 'updated_at'])
     
     def reactivate(self):
         """Reactivate cancelled subscription"""
         self.status = 'active'
         self.cancel_at_period_end = False
-        self.save()
+        self.save(update_fields=['status', 'cancel_at_period_end', 'updated_at'])
 
 class Invoice(models.Model):
     """Invoice model for billing"""
@@ -314,6 +325,9 @@ class Invoice(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Invoice'
         verbose_name_plural = 'Invoices'
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='invoice_user_created_idx'),
+        ]
     
     def __str__(self):
         return f"Invoice {self.invoice_number} - {self.user.email} - ${self.total}"
@@ -380,6 +394,14 @@ class PaymentMethod(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Payment Method'
         verbose_name_plural = 'Payment Methods'
+        indexes = [
+            # The default method lookup, over default rows only
+            models.Index(
+                fields=['user'],
+                condition=models.Q(is_default=True),
+                name='payment_method_default_idx'
+            ),
+        ]
     
     def __str__(self):
         if self.type == 'card':
@@ -422,52 +444,91 @@ class UsageLog(models.Model):
     # Metadata
     metadata = models.JSONField(default=dict, blank=True)
     
-    # Timestamps
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Timestamps (set when the usage is recorded, which may be before the row is written)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Usage Log'
         verbose_name_plural = 'Usage Logs'
+        indexes = [
+            # A user's usage in a created_at range
+            models.Index(fields=['user', 'created_at'], name='usage_log_user_created_idx'),
+            # Usage compaction scans new rows by created_at alone
+            models.Index(fields=['created_at'], name='usage_log_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.service_type} - {self.characters_processed} chars"
 
+class UsageHourlyRollup(models.Model):
+    """Usage per user and service type for one hour, compacted from UsageLog"""
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='usage_hourly_rollups')
+    service_type = models.CharField(max_length=50)
+    period_start = models.DateTimeField()  # Start of the hour
+    
+    # Totals
+    request_count = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    characters_processed = models.PositiveBigIntegerField(default=0)
+    processing_time = models.DurationField(default=timedelta)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-period_start']
+        verbose_name = 'Hourly Usage Rollup'
+        verbose_name_plural = 'Hourly Usage Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'period_start', 'service_type'], name='usage_hourly_rollup_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.service_type} - {self.period_start:%Y-%m-%d %H:00} - {self.request_count} requests"
+
+class UsageDailyRollup(models.Model):
+    """Usage per user and service type for one day, compacted from UsageLog"""
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='usage_daily_rollups')
+    service_type = models.CharField(max_length=50)
+    day = models.DateField()  # In settings.TIME_ZONE
+    
+    # Totals
+    request_count = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    characters_processed = models.PositiveBigIntegerField(default=0)
+    processing_time = models.DurationField(default=timedelta)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-day']
+        verbose_name = 'Daily Usage Rollup'
+        verbose_name_plural = 'Daily Usage Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day', 'service_type'], name='usage_daily_rollup_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.service_type} - {self.day} - {self.request_count} requests"
+
+class UsageRollupState(models.Model):
+    """How far UsageLog has been compacted into the rollup tables"""
+    
+    name = models.CharField(max_length=50, unique=True)
+    compacted_until = models.DateTimeField()  # UsageLog rows created before this are rolled up
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} compacted until {self.compacted_until}"
+
 # Signals for automatic actions
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_delete
 from django.dispatch import receiver
 
-@receiver(post_save, sender=Payment)
-def handle_payment_save(sender, instance, created, **kwargs):
-    """Handle payment save events"""
-    if created and instance.status == 'completed':
-        # Create or update subscription
-        subscription, created = Subscription.objects.get_or_create(
-            user=instance.user,
-            defaults={
-                'plan': instance.plan,
-                'status': 'active',
-                'start_date': instance.created_at,
-                'end_date': instance.created_at + timedelta(days=30),
-                'current_period_start': instance.created_at,
-                'current_period_end': instance.created_at + timedelta(days=30),
-                'payment': instance,
-            }
-        )
-        
-        if not created:
-            subscription.status = 'active'
-            subscription.payment = instance
-            subscription.save()
-
-@receiver(post_save, sender=Subscription)
-def handle_subscription_save(sender, instance, created, **kwargs):
-    """Handle subscription save events"""
-    if created:
-        # Reset usage counters for new subscription
-        instance.requests_used_this_month = 0
-        instance.characters_used_this_month = 0
-        instance.save()
+# Completed payments activate subscriptions through
+# subscription_service.activate_subscription, not signals
 
 @receiver(post_delete, sender=PaymentMethod)
 def handle_payment_method_delete(sender, instance, **kwargs):
@@ -21,6 +21,7 @@ urlpatterns = [
     # Subscription Management
     path('subscription/cancel/', payment_views.cancel_subscription, name='cancel_subscription'),
     path('history/', payment_views.get_payment_history, name='payment_history'),
+    path('usage/', payment_views.get_usage_summary, name='usage_summary'),
     
     # Health Check
     path('health/', payment_views.health_check, name='health_check'),
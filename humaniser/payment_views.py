@@ -216,18 +216,15 @@ def confirm_stripe_payment(request):
         )
         
         if intent.status == 'succeeded':
-            # Create payment record
-            # payment = Payment.objects.create(
-            #     user=request.user,
-            #     amount=intent.amount / 100,
-            #     currency=intent.currency,
-            #     payment_method='stripe',
-            #     transaction_id=intent.id,
-            #     status='completed'
-            # )
-            
-            # Activate subscription
-            # activate_user_subscription(request.user, intent.metadata.get('plan_id'))
+            # Record the payment and activate the subscription in one transaction
+            activate_user_subscription(request.user, intent.metadata.get('plan_id'), payment_details={
+                'amount': Decimal(intent.amount) / 100,
+                'currency': intent.currency.upper(),
+                'payment_method': 'stripe',
+                'transaction_id': intent.id,
+                'billing_email': billing_details.get('email', request.user.email),
+                'billing_name': billing_details.get('name', ''),
+            })
             
             logger.info(f"Stripe payment successful: {intent.id}")
             
@@ -265,9 +262,9 @@ def confirm_paypal_payment(request):
         payment_id = data.get('payment_id')
         payer_id = data.get('payer_id')
         
-        if not payment_id or not payer_id:
+        if not payment_id or not payer_id or not data.get('plan_id'):
             return Response(
-                {'error': 'Payment ID and payer ID are required'}, 
+                {'error': 'Payment ID, payer ID and plan ID are required'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
@@ -275,18 +272,15 @@ def confirm_paypal_payment(request):
         payment = PaymentProcessor.execute_paypal_payment(payment_id, payer_id)
         
         if payment.state == 'approved':
-            # Create payment record
-            # payment_record = Payment.objects.create(
-            #     user=request.user,
-            #     amount=Decimal(payment.transactions[0].amount.total),
-            #     currency=payment.transactions[0].amount.currency,
-            #     payment_method='paypal',
-            #     transaction_id=payment.id,
-            #     status='completed'
-            # )
-            
-            # Activate subscription
-            # activate_user_subscription(request.user, payment.transactions[0].item_list.items[0].sku)
+            # Record the payment and activate the subscription in one transaction
+            activate_user_subscription(request.user, data.get('plan_id'), payment_details={
+                'amount': Decimal(payment.transactions[0].amount.total),
+                'currency': payment.transactions[0].amount.currency,
+                'payment_method': 'paypal',
+                'transaction_id': payment.id,
+                'billing_email': request.user.email,
+                'billing_name': request.user.get_full_name(),
+            })
             
             logger.info(f"PayPal payment successful: {payment.id}")
             
@@ -332,8 +326,9 @@ def stripe_webhook(request):
         payment_intent = event['data']['object']
         logger.info(f"Payment succeeded: {payment_intent['id']}")
         
-        # Update payment status and activate subscription
-        # handle_payment_success(payment_intent)
+        # Record the payment and activate the subscription (a no-op if the
+        # confirm endpoint already did)
+        handle_payment_success(payment_intent)
         
     elif event['type'] == 'payment_intent.payment_failed':
         payment_intent = event['data']['object']
@@ -415,6 +410,55 @@ def get_payment_history(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_usage_summary(request):
+    """Get user's usage per day (or hour) and service, from the usage rollups"""
+    from datetime import timedelta
+    from .usage_rollups import get_usage, get_usage_totals
+
+    try:
+        granularity = request.GET.get('granularity', 'day')
+        if granularity not in ('day', 'hour'):
+            return Response(
+                {'error': "granularity must be 'day' or 'hour'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            days = min(max(int(request.GET.get('days', 30)), 1), 366)
+        except ValueError:
+            return Response(
+                {'error': 'days must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        service_type = request.GET.get('service_type') or None
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(days=days)
+
+        totals = get_usage_totals(request.user, start, end, service_type=service_type)
+        periods = get_usage(request.user, start, end, granularity=granularity, service_type=service_type)
+
+        return Response({
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'totals': {**totals, 'processing_time': totals['processing_time'].total_seconds()},
+            'usage': [
+                {
+                    **row,
+                    'period': row['period'].isoformat(),
+                    'processing_time': row['processing_time'].total_seconds(),
+                }
+                for row in periods
+            ]
+        })
+
+    except Exception as e:
+        logger.error(f"Failed to get usage summary: {e}")
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def cancel_subscription(request):
@@ -488,30 +532,17 @@ def health_check(request):
 
 # Utility functions (to be implemented based on your models)
 
-def activate_user_subscription(user, plan_id):
+def activate_user_subscription(user, plan_id, payment_details=None):
     """Activate user subscription after successful payment"""
+    from .payment_models import Plan
+    from .subscription_service import activate_subscription
+
     try:
-        # Get the plan
-        # plan = Plan.objects.get(id=plan_id)
-        
-        # Create or update subscription
-        # subscription, created = Subscription.objects.get_or_create(
-        #     user=user,
-        #     defaults={
-        #         'plan': plan,
-        #         'status': 'active',
-        #         'start_date': datetime.now(timezone.utc),
-        #         'end_date': datetime.now(timezone.utc) + timedelta(days=30)
-        #     }
-        # )
-        
-        # if not created:
-        #     subscription.status = 'active'
-        #     subscription.start_date = datetime.now(timezone.utc)
-        #     subscription.end_date = datetime.now(timezone.utc) + timedelta(days=30)
-        #     subscription.save()
+        plan = Plan.objects.get(id=plan_id)
+        payment, subscription = activate_subscription(user, plan, payment_details)
         
         logger.info(f"Subscription activated for user: {user.id}")
+        return subscription
         
     except Exception as e:
         logger.error(f"Failed to activate subscription: {e}")
@@ -519,17 +550,19 @@ def activate_user_subscription(user, plan_id):
 
 def handle_payment_success(payment_intent):
     """Handle successful payment"""
+    from django.contrib.auth.models import User
+
     try:
-        # Update payment status
-        # payment = Payment.objects.get(transaction_id=payment_intent['id'])
-        # payment.status = 'completed'
-        # payment.save()
-        
-        # Activate subscription
-        # user_id = payment_intent['metadata'].get('user_id')
-        # plan_id = payment_intent['metadata'].get('plan_id')
-        # user = User.objects.get(id=user_id)
-        # activate_user_subscription(user, plan_id)
+        metadata = payment_intent.get('metadata', {})
+        user = User.objects.get(id=metadata.get('user_id'))
+        activate_user_subscription(user, metadata.get('plan_id'), payment_details={
+            'amount': Decimal(payment_intent['amount']) / 100,
+            'currency': payment_intent['currency'].upper(),
+            'payment_method': 'stripe',
+            'transaction_id': payment_intent['id'],
+            'billing_email': user.email,
+            'billing_name': user.get_full_name(),
+        })
         
         logger.info(f"Payment success handled: {payment_intent['id']}")
         
@@ -0,0 +1,93 @@
+"""
+Subscription Service - records a completed payment and activates the user's subscription in one transaction
+"""
+import logging
+from datetime import timedelta
+from typing import Dict, Any, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .payment_models import Payment, Subscription
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_PERIOD = timedelta(days=30)
+
+# Columns written when an existing subscription is reactivated
+ACTIVATION_FIELDS = [
+    'plan', 'status', 'payment', 'start_date', 'end_date', 'cancelled_at',
+    'current_period_start', 'current_period_end', 'cancel_at_period_end',
+    'requests_used_this_month', 'characters_used_this_month', 'updated_at',
+]
+
+def activate_subscription(user, plan, payment_details: Dict[str, Any] = None,
+                          period: timedelta = SUBSCRIPTION_PERIOD) -> Tuple[Optional[Payment], Subscription]:
+    """
+    Record a completed payment (if given) and start a new subscription period
+
+    The user's latest subscription is reactivated for the plan, or a new
+    one is created, with fresh period dates and zeroed usage counters. The
+    user row is locked first, so concurrent activations for the same user
+    (e.g. the confirm endpoint and the gateway webhook) run one after the
+    other and cannot both create a subscription. A payment whose
+    transaction_id is already recorded is not applied again.
+
+    Args:
+        user: User the subscription belongs to
+        plan: Plan to activate
+        payment_details: Payment fields (amount, currency, payment_method,
+            transaction_id, billing_email, billing_name, ...) for the
+            completed payment, or None to activate without one
+        period: Length of the subscription period
+
+    Returns:
+        Tuple of (payment or None, subscription)
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        User.objects.select_for_update().values_list('pk', flat=True).get(pk=user.pk)
+        subscription = (
+            Subscription.objects.select_for_update()
+            .filter(user=user)
+            .order_by('-created_at')
+            .first()
+        )
+
+        transaction_id = (payment_details or {}).get('transaction_id')
+        if transaction_id:
+            existing = Payment.objects.filter(transaction_id=transaction_id).first()
+            if existing is not None:
+                logger.info(f"Payment {transaction_id} already recorded, subscription not changed")
+                return existing, subscription
+
+        payment = None
+        if payment_details is not None:
+            payment = Payment.objects.create(
+                user=user, plan=plan, status='completed', completed_at=now, **payment_details
+            )
+
+        values = {
+            'plan': plan,
+            'status': 'active',
+            # Keep the current payment by id, without loading it
+            'payment_id': payment.pk if payment is not None else getattr(subscription, 'payment_id', None),
+            'start_date': now,
+            'end_date': now + period,
+            'cancelled_at': None,
+            'current_period_start': now,
+            'current_period_end': now + period,
+            'cancel_at_period_end': False,
+            'requests_used_this_month': 0,
+            'characters_used_this_month': 0,
+        }
+        if subscription is None:
+            subscription = Subscription.objects.create(user=user, **values)
+        else:
+            for field, value in values.items():
+                setattr(subscription, field, value)
+            subscription.save(update_fields=ACTIVATION_FIELDS)
+
+    logger.info(f"Subscription {subscription.pk} activated for user {user.pk} on plan {plan.slug}")
+    return payment, subscription
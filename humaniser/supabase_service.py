@@ -3,16 +3,76 @@ Supabase Service for Django Integration
 Handles authentication, real-time features, and database operations
 """
 import os
+import json
+import time
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Iterator
 from django.conf import settings
 from django.core.cache import cache
 import requests
 from supabase import create_client, Client
 from supabase.lib.client_options import ClientOptions
 
+from . import token_auth
+from .supabase_transport import SupabaseRestTransport
+from .token_auth import InvalidToken, TokenCache, TokenVerifier
+
 logger = logging.getLogger(__name__)
 
+# Django-style filter lookups ("field__gte") and their PostgREST operators
+FILTER_LOOKUPS = {
+    "exact": "eq",
+    "neq": "neq",
+    "gt": "gt",
+    "gte": "gte",
+    "lt": "lt",
+    "lte": "lte",
+    "in": "in",
+    "like": "like",
+    "ilike": "ilike",
+    "isnull": "is",
+}
+
+class DjangoTokenCache:
+    """
+    TokenCache interface over Django's cache, so verified tokens are shared
+    by every process and a sign-out drops a token for all of them. Cache
+    errors are logged and treated as misses.
+    """
+
+    def __init__(self, ttl: int = 300, prefix: str = "supabase:token"):
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, token: str) -> str:
+        return f"{self.prefix}:{TokenCache.key_for(token)}"
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            return cache.get(self._key(token))
+        except Exception as e:
+            logger.warning(f"Failed to read cached token: {e}")
+            return None
+
+    def set(self, token: str, claims: Dict[str, Any], expires_at: float = None):
+        timeout = self.ttl
+        if expires_at is not None:
+            timeout = min(timeout, int(expires_at - time.time()))
+        if timeout <= 0:
+            return
+        try:
+            cache.set(self._key(token), claims, timeout)
+        except Exception as e:
+            logger.warning(f"Failed to cache token: {e}")
+
+    def discard(self, token: str):
+        try:
+            cache.delete(self._key(token))
+        except Exception as e:
+            logger.warning(f"Failed to drop cached token: {e}")
+
 class SupabaseService:
     """
     Service class for handling Supabase operations in Django
@@ -22,22 +82,87 @@ class SupabaseService:
         self.url = settings.SUPABASE_URL
         self.anon_key = settings.SUPABASE_ANON_KEY
         self.service_key = settings.SUPABASE_SERVICE_ROLE_KEY
+        self.jwt_secret = getattr(settings, 'SUPABASE_JWT_SECRET', None)
+        self.jwt_audience = getattr(settings, 'SUPABASE_JWT_AUDIENCE', 'authenticated')
+        self.user_cache_ttl = getattr(settings, 'SUPABASE_USER_CACHE_TTL', 300)
+        self.bulk_chunk_size = getattr(settings, 'SUPABASE_BULK_CHUNK_SIZE', 500)
+        self.bulk_concurrency = getattr(settings, 'SUPABASE_BULK_CONCURRENCY', 4)
+        self.query_cache_ttls = getattr(settings, 'SUPABASE_QUERY_CACHE_TTLS', {})
+        self.query_cache_default_ttl = getattr(settings, 'SUPABASE_QUERY_CACHE_DEFAULT_TTL', 0)
+        
+        if token_auth.jwt is None:
+            logger.warning("PyJWT not installed; access tokens will be verified by the Supabase auth server")
+        # Same verifier as the AI API: HS256 tokens locally, anything else by the auth server
+        self.token_verifier = TokenVerifier(
+            self.jwt_secret,
+            remote_verify=self._verify_remotely,
+            audience=self.jwt_audience or None,
+            cache=DjangoTokenCache(ttl=self.user_cache_ttl),
+        )
         
+        self.rest = None
         if not all([self.url, self.anon_key]):
             logger.warning("Supabase credentials not configured")
             self.client = None
         else:
             try:
                 self.client = create_client(self.url, self.anon_key)
+                # Table operations share one pooled, keep-alive HTTP transport
+                self.rest = SupabaseRestTransport(
+                    self.url,
+                    self.anon_key,
+                    pool_size=getattr(settings, 'SUPABASE_HTTP_POOL_SIZE', 10),
+                    connect_timeout=getattr(settings, 'SUPABASE_HTTP_CONNECT_TIMEOUT', 3.05),
+                    read_timeout=getattr(settings, 'SUPABASE_HTTP_READ_TIMEOUT', 10.0),
+                    retries=getattr(settings, 'SUPABASE_HTTP_RETRIES', 3),
+                    backoff_factor=getattr(settings, 'SUPABASE_HTTP_BACKOFF', 0.3),
+                )
                 logger.info("Supabase client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Supabase client: {e}")
                 self.client = None
+                self.rest = None
     
     def is_available(self) -> bool:
         """Check if Supabase is properly configured and available"""
         return self.client is not None
     
+    def transport_stats(self) -> Optional[Dict[str, Any]]:
+        """Connection pool utilization of the table operations transport, or None if not configured"""
+        return self.rest.stats() if self.rest else None
+    
+    @classmethod
+    def _filter_params(cls, filters: Dict[str, Any] = None) -> List[tuple]:
+        """
+        Convert filters to PostgREST query parameters
+        
+        Args:
+            filters: {column: value} for equality, or {column__lookup: value}
+                with a lookup from FILTER_LOOKUPS, e.g. {"created_at__gte": ...,
+                "status__in": [...], "deleted_at__isnull": True}
+            
+        Returns:
+            List of (column, "operator.value") pairs; a column may repeat
+        """
+        params = []
+        for key, value in (filters or {}).items():
+            column, _, lookup = key.partition("__")
+            if lookup and lookup not in FILTER_LOOKUPS:
+                raise ValueError(f"Unsupported filter lookup: {key}")
+            operator = FILTER_LOOKUPS[lookup or "exact"]
+            
+            if operator == "in":
+                params.append((column, cls._in_filter(value)))
+            elif operator == "is":
+                params.append((column, "is.null" if value else "not.is.null"))
+            elif value is None:
+                params.append((column, "is.null" if operator == "eq" else "not.is.null"))
+            elif isinstance(value, bool):
+                params.append((column, f"{operator}.{str(value).lower()}"))
+            else:
+                params.append((column, f"{operator}.{value}"))
+        return params
+    
     # Authentication Methods
     def sign_up(self, email: str, password: str, user_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -123,7 +248,9 @@ class SupabaseService:
             raise Exception("Supabase not configured")
         
         try:
-            self.client.auth.sign_out()
+            # Revoke this user's session on the auth server; the shared client holds no session of its own
+            self.client.auth.admin.sign_out(access_token)
+            self.token_verifier.cache.discard(access_token)
             logger.info("User signed out successfully")
             return {"success": True}
         except Exception as e:
@@ -137,23 +264,56 @@ class SupabaseService:
         """
         Get user data from access token
         
+        HS256 tokens are verified locally against SUPABASE_JWT_SECRET; the auth
+        server is only asked about tokens that cannot be verified locally.
+        Verified tokens are cached (in Django's cache) until the earlier of
+        SUPABASE_USER_CACHE_TTL and the token's expiry.
+        
         Args:
             access_token: User's access token
             
         Returns:
             User data or None if invalid
         """
-        if not self.is_available():
+        if not access_token:
             return None
         
         try:
-            # Set the access token for this request
-            self.client.auth.set_session(access_token, None)
-            user = self.client.auth.get_user()
-            return user.user if user else None
-        except Exception as e:
-            logger.error(f"Failed to get user: {e}")
+            claims, _ = self.token_verifier.verify(access_token)
+        except InvalidToken as e:
+            logger.warning(f"Failed to get user: {e}")
             return None
+        return self._user_from_claims(claims)
+    
+    def _verify_remotely(self, access_token: str) -> Dict[str, Any]:
+        """Ask the auth server about a token that cannot be verified locally; returns claims"""
+        if not self.is_available():
+            raise Exception("Supabase not configured")
+        # Pass the token explicitly instead of setting a session on the shared client
+        response = self.client.auth.get_user(access_token)
+        if not response or not response.user:
+            raise Exception("Invalid user token")
+        user = response.user
+        return {
+            "sub": str(user.id),
+            "email": user.email,
+            "role": getattr(user, "role", None),
+            "aud": getattr(user, "aud", None),
+            "user_metadata": getattr(user, "user_metadata", None) or {},
+            "app_metadata": getattr(user, "app_metadata", None) or {},
+        }
+    
+    @staticmethod
+    def _user_from_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": claims["sub"],
+            "email": claims.get("email"),
+            "role": claims.get("role"),
+            "aud": claims.get("aud"),
+            "user_metadata": claims.get("user_metadata", {}),
+            "app_metadata": claims.get("app_metadata", {}),
+            "exp": claims.get("exp"),
+        }
     
     def reset_password(self, email: str) -> Dict[str, Any]:
         """
@@ -195,10 +355,13 @@ class SupabaseService:
             raise Exception("Supabase not configured")
         
         try:
-            response = self.client.table(table).insert(data).execute()
+            rows = self.rest.request(
+                "POST", table, json=data,
+                headers={"Prefer": "return=representation"}
+            )
             logger.info(f"Data inserted into {table}")
             return {
-                "data": response.data,
+                "data": rows,
                 "success": True
             }
         except Exception as e:
@@ -207,14 +370,27 @@ class SupabaseService:
                 "error": str(e),
                 "success": False
             }
+        finally:
+            self.invalidate_table(table)
     
-    def get_data(self, table: str, filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def get_data(self, table: str, filters: Dict[str, Any] = None, columns: List[str] = None,
+                 order_by: str = None, limit: int = None, offset: int = None,
+                 use_cache: bool = True) -> Dict[str, Any]:
         """
         Get data from Supabase table
         
+        Results are cached for tables with a TTL in SUPABASE_QUERY_CACHE_TTLS
+        (or SUPABASE_QUERY_CACHE_DEFAULT_TTL) until the TTL runs out or a write
+        or realtime change on the table invalidates them.
+        
         Args:
             table: Table name
-            filters: Optional filters
+            filters: Optional filters (see _filter_params for range and in lookups)
+            columns: Columns to return (default: all)
+            order_by: Column to sort by, prefixed with "-" for descending
+            limit: Maximum number of rows to return
+            offset: Number of rows to skip
+            use_cache: Set to False to always read from Supabase
             
         Returns:
             Dict containing retrieved data
@@ -223,16 +399,33 @@ class SupabaseService:
             raise Exception("Supabase not configured")
         
         try:
-            query = self.client.table(table).select("*")
+            params = self._query_params(filters, columns, order_by, limit, offset)
+            ttl = self._query_cache_ttl(table) if use_cache else 0
+            cache_key = None
+            if ttl > 0:
+                try:
+                    cache_key = self._query_cache_key(table, params)
+                    rows = cache.get(cache_key)
+                except Exception as e:
+                    # A cache outage only costs the cache, the read goes to Supabase
+                    logger.warning(f"Failed to read cached query for {table}: {e}")
+                    cache_key = rows = None
+                if rows is not None:
+                    logger.debug(f"Data for {table} served from cache")
+                    return {
+                        "data": rows,
+                        "success": True
+                    }
             
-            if filters:
-                for key, value in filters.items():
-                    query = query.eq(key, value)
-            
-            response = query.execute()
+            rows = self.rest.request("GET", table, params=params)
+            if cache_key is not None:
+                try:
+                    cache.set(cache_key, rows, ttl)
+                except Exception as e:
+                    logger.warning(f"Failed to cache query for {table}: {e}")
             logger.info(f"Data retrieved from {table}")
             return {
-                "data": response.data,
+                "data": rows,
                 "success": True
             }
         except Exception as e:
@@ -242,6 +435,102 @@ class SupabaseService:
                 "success": False
             }
     
+    def iter_data(self, table: str, filters: Dict[str, Any] = None, columns: List[str] = None,
+                  order_by: str = "id", page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream rows page by page, holding one page in memory at a time
+        
+        Pages are fetched with keyset (cursor) pagination on order_by, which
+        must be unique, so later pages cost the same as the first and rows
+        changed between pages are neither skipped nor repeated.
+        
+        Args:
+            table: Table name
+            filters: Optional filters (see _filter_params)
+            columns: Columns to return (default: all)
+            order_by: Unique cursor column, prefixed with "-" for descending
+            page_size: Rows per request
+            
+        Yields:
+            Rows in order_by order
+        """
+        if not self.is_available():
+            raise Exception("Supabase not configured")
+        
+        cursor_column = order_by.lstrip("-")
+        cursor_lookup = "lt" if order_by.startswith("-") else "gt"
+        fetch_columns = columns
+        if columns and cursor_column not in columns:
+            fetch_columns = list(columns) + [cursor_column]
+        
+        cursor = None
+        while True:
+            params = self._query_params(filters, fetch_columns, order_by, page_size)
+            if cursor is not None:
+                params.append((cursor_column, f"{cursor_lookup}.{cursor}"))
+            rows = self.rest.request("GET", table, params=params) or []
+            if rows:
+                cursor = rows[-1][cursor_column]
+            for row in rows:
+                if fetch_columns is not columns:
+                    row.pop(cursor_column, None)
+                yield row
+            if len(rows) < page_size:
+                return
+    
+    # Query Cache
+    def _query_cache_ttl(self, table: str) -> int:
+        return self.query_cache_ttls.get(table, self.query_cache_default_ttl)
+    
+    @staticmethod
+    def _table_version_key(table: str) -> str:
+        return f"supabase:query-version:{table}"
+    
+    def _table_version(self, table: str) -> int:
+        key = self._table_version_key(table)
+        version = cache.get(key)
+        if version is None:
+            # Start from the clock so a lost version key never revives older entries
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        return version
+    
+    def _query_cache_key(self, table: str, params: List[tuple]) -> str:
+        digest = hashlib.sha256(json.dumps(params, default=str).encode("utf-8")).hexdigest()
+        return f"supabase:query:{table}:{self._table_version(table)}:{digest}"
+    
+    def invalidate_table(self, table: str) -> None:
+        """
+        Drop every cached get_data result for a table (by moving it to a new version)
+        
+        Writes call this whether or not they succeed, since a failed request
+        may still have been applied. It is a no-op for tables that are not
+        cached, and never raises: a cache outage must not fail the write.
+        """
+        if not self._query_cache_ttl(table):
+            return
+        key = self._table_version_key(table)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, time.time_ns(), None)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached queries for {table}: {e}")
+    
+    def _query_params(self, filters: Dict[str, Any] = None, columns: List[str] = None, order_by: str = None,
+                      limit: int = None, offset: int = None) -> List[tuple]:
+        params = [("select", ",".join(columns) if columns else "*")]
+        params.extend(self._filter_params(filters))
+        if order_by:
+            direction = "desc" if order_by.startswith("-") else "asc"
+            params.append(("order", f"{order_by.lstrip('-')}.{direction}"))
+        if limit is not None:
+            params.append(("limit", limit))
+        if offset:
+            params.append(("offset", offset))
+        return params
+    
     def update_data(self, table: str, data: Dict[str, Any], filters: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update data in Supabase table
@@ -258,15 +547,13 @@ class SupabaseService:
             raise Exception("Supabase not configured")
         
         try:
-            query = self.client.table(table).update(data)
-            
-            for key, value in filters.items():
-                query = query.eq(key, value)
-            
-            response = query.execute()
+            rows = self.rest.request(
+                "PATCH", table, params=self._filter_params(filters), json=data,
+                headers={"Prefer": "return=representation"}
+            )
             logger.info(f"Data updated in {table}")
             return {
-                "data": response.data,
+                "data": rows,
                 "success": True
             }
         except Exception as e:
@@ -275,6 +562,8 @@ class SupabaseService:
                 "error": str(e),
                 "success": False
             }
+        finally:
+            self.invalidate_table(table)
     
     def delete_data(self, table: str, filters: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -291,15 +580,13 @@ class SupabaseService:
             raise Exception("Supabase not configured")
         
         try:
-            query = self.client.table(table).delete()
-            
-            for key, value in filters.items():
-                query = query.eq(key, value)
-            
-            response = query.execute()
+            rows = self.rest.request(
+                "DELETE", table, params=self._filter_params(filters),
+                headers={"Prefer": "return=representation"}
+            )
             logger.info(f"Data deleted from {table}")
             return {
-                "data": response.data,
+                "data": rows,
                 "success": True
             }
         except Exception as e:
@@ -308,6 +595,123 @@ class SupabaseService:
                 "error": str(e),
                 "success": False
             }
+        finally:
+            self.invalidate_table(table)
+    
+    # Bulk Operations (prefer these over looping over the single-row methods)
+    def insert_many(self, table: str, rows: List[Dict[str, Any]], chunk_size: int = None) -> Dict[str, Any]:
+        """
+        Insert many rows, in chunks sent concurrently
+        
+        Args:
+            table: Table name
+            rows: Rows to insert (columns missing from a row get their defaults)
+            chunk_size: Rows per request (default SUPABASE_BULK_CHUNK_SIZE)
+            
+        Returns:
+            Dict containing inserted data and per-chunk results
+        """
+        return self._run_chunks(
+            "insert", table, self._chunk(rows, chunk_size),
+            lambda chunk: self.rest.request(
+                "POST", table, json=chunk,
+                headers={"Prefer": "return=representation,missing=default"}
+            )
+        )
+    
+    def upsert_many(self, table: str, rows: List[Dict[str, Any]], on_conflict: str = None,
+                    chunk_size: int = None) -> Dict[str, Any]:
+        """
+        Insert or update many rows, in chunks sent concurrently
+        
+        Args:
+            table: Table name
+            rows: Rows to upsert
+            on_conflict: Comma-separated unique columns to match on (default: primary key)
+            chunk_size: Rows per request (default SUPABASE_BULK_CHUNK_SIZE)
+            
+        Returns:
+            Dict containing upserted data and per-chunk results
+        """
+        params = {"on_conflict": on_conflict} if on_conflict else None
+        return self._run_chunks(
+            "upsert", table, self._chunk(rows, chunk_size),
+            lambda chunk: self.rest.request(
+                "POST", table, params=params, json=chunk,
+                headers={"Prefer": "resolution=merge-duplicates,return=representation,missing=default"}
+            )
+        )
+    
+    def delete_many(self, table: str, column: str, values: List[Any], chunk_size: int = None) -> Dict[str, Any]:
+        """
+        Delete the rows whose column matches any of values, in chunks sent concurrently
+        
+        Args:
+            table: Table name
+            column: Column to match
+            values: Values to delete
+            chunk_size: Values per request (default SUPABASE_BULK_CHUNK_SIZE)
+            
+        Returns:
+            Dict containing deleted data and per-chunk results
+        """
+        return self._run_chunks(
+            "delete", table, self._chunk(values, chunk_size),
+            lambda chunk: self.rest.request(
+                "DELETE", table, params={column: self._in_filter(chunk)},
+                headers={"Prefer": "return=representation"}
+            )
+        )
+    
+    def _chunk(self, items: List[Any], chunk_size: int = None) -> List[List[Any]]:
+        size = max(1, chunk_size or self.bulk_chunk_size)
+        items = list(items)
+        return [items[start:start + size] for start in range(0, len(items), size)]
+    
+    @staticmethod
+    def _in_filter(values: List[Any]) -> str:
+        """Build a PostgREST in.(...) filter, quoting values so commas and parentheses are safe"""
+        quoted = []
+        for value in values:
+            value = str(value).lower() if isinstance(value, bool) else str(value)
+            quoted.append('"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"')
+        return f"in.({','.join(quoted)})"
+    
+    def _run_chunks(self, operation: str, table: str, chunks: List[List[Any]], send: callable) -> Dict[str, Any]:
+        """Send chunks with bounded concurrency and aggregate their results in chunk order"""
+        if not self.is_available():
+            raise Exception("Supabase not configured")
+        
+        def run(index_chunk):
+            index, chunk = index_chunk
+            try:
+                return {"index": index, "rows": len(chunk), "data": send(chunk) or [], "success": True}
+            except Exception as e:
+                logger.debug(f"{operation} chunk {index} for {table} failed: {e}")
+                return {"index": index, "rows": len(chunk), "error": str(e), "success": False}
+        
+        workers = max(1, min(self.bulk_concurrency, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, enumerate(chunks)))
+        self.invalidate_table(table)
+        
+        data = []
+        for result in results:
+            data.extend(result.pop("data", []))
+        failed = [result for result in results if not result["success"]]
+        total = sum(result["rows"] for result in results)
+        
+        if failed:
+            logger.error(f"Bulk {operation} into {table}: {len(failed)} of {len(results)} chunks failed")
+        else:
+            logger.info(f"Bulk {operation} into {table}: {total} rows in {len(results)} chunks")
+        return {
+            "data": data,
+            "chunks": results,
+            "rows": total,
+            "failed_rows": sum(result["rows"] for result in failed),
+            "success": not failed
+        }
     
     # Real-time Features
     def subscribe_to_changes(self, table: str, callback: callable) -> str:
@@ -324,8 +728,13 @@ class SupabaseService:
         if not self.is_available():
             raise Exception("Supabase not configured")
         
+        def on_change(payload):
+            # Cached reads of the table are stale once it changes
+            self.invalidate_table(table)
+            return callback(payload)
+        
         try:
-            subscription = self.client.table(table).on('*', callback).subscribe()
+            subscription = self.client.table(table).on('*', on_change).subscribe()
             logger.info(f"Subscribed to changes in {table}")
             return subscription
         except Exception as e:
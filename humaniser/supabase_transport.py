@@ -0,0 +1,135 @@
+"""
+Pooled HTTP transport for Supabase's REST (PostgREST) API
+"""
+import threading
+import logging
+from typing import Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+class SupabaseRestTransport:
+    """
+    Keep-alive HTTP transport shared by all SupabaseService table operations.
+
+    One requests.Session holds a bounded pool of persistent connections, so
+    requests reuse TCP/TLS connections instead of setting up new ones.
+    Idempotent requests are retried with exponential backoff on connection
+    errors and 502/503/504 responses.
+    """
+
+    def __init__(self, url: str, api_key: str, pool_size: int = 10, connect_timeout: float = 3.05,
+                 read_timeout: float = 10.0, retries: int = 3, backoff_factor: float = 0.3):
+        """
+        Args:
+            url: Supabase project URL
+            api_key: Key sent as apikey and bearer token
+            pool_size: Maximum number of connections kept open per host
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for a response
+            retries: Maximum retries for idempotent requests
+            backoff_factor: Base delay for exponential backoff between retries
+        """
+        self.base_url = url.rstrip('/') + '/rest/v1/'
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "apikey": api_key,
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+        self.adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._retries = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+
+    def request(self, method: str, table: str, params: Dict[str, Any] = None, json: Any = None,
+                headers: Dict[str, str] = None) -> Any:
+        """
+        Send a request for a table and return the decoded JSON body
+
+        Args:
+            method: HTTP method
+            table: Table name
+            params: PostgREST query parameters (filters, select, ...)
+            json: Request body
+            headers: Extra headers (e.g. Prefer)
+
+        Returns:
+            Decoded response body, or None if it is empty
+        """
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        try:
+            response = self.session.request(
+                method, self.base_url + table,
+                params=params, json=json, headers=headers, timeout=self.timeout
+            )
+            retries = getattr(response.raw, 'retries', None)
+            if retries is not None and retries.history:
+                with self._lock:
+                    self._retries += len(retries.history)
+            response.raise_for_status()
+            return response.json() if response.content else None
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool utilization counters
+
+        Returns:
+            Dict with request/error/retry totals, current and peak in-flight
+            requests, and per-host connection counts
+        """
+        pools = []
+        for key in list(self.adapter.poolmanager.pools.keys()):
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            pools.append({
+                "host": pool.host,
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle_connections": sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0,
+            })
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "requests": self._requests,
+                "errors": self._errors,
+                "retries": self._retries,
+                "in_flight": self._in_flight,
+                "max_in_flight": self._max_in_flight,
+                "pools": pools,
+            }
+
+    def close(self):
+        self.session.close()
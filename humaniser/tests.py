@@ -1,3 +1,106 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone as dt_timezone
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from .payment_models import Plan, Subscription, UsageLog
+from .usage_rollups import compact_usage, get_usage, get_usage_totals
+
+def utc(hour, minute=0, day=1):
+    return datetime(2026, 10, day, hour, minute, tzinfo=dt_timezone.utc)
+
+class UsageRollupTests(TestCase):
+    """get_usage_totals must count every UsageLog row once, whatever mix of rollups and live rows it reads
+
+    Range starts are whole hours, since get_usage_totals rounds start down to the hour.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create(username='rollups', email='rollups@example.com')
+        plan = Plan.objects.create(name='Pro', slug='pro', price=10)
+        self.subscription = Subscription.objects.create(
+            user=self.user, plan=plan, start_date=utc(0), end_date=utc(0) + timedelta(days=30),
+            current_period_start=utc(0), current_period_end=utc(0) + timedelta(days=30)
+        )
+        self.logs = []
+
+    def log(self, created_at, characters=10, success=True, service_type='text_humanization'):
+        UsageLog.objects.create(
+            user=self.user, subscription=self.subscription, service_type=service_type,
+            characters_processed=characters, processing_time=timedelta(seconds=1),
+            success=success, created_at=created_at
+        )
+        self.logs.append((created_at, characters, success, service_type))
+
+    def expected(self, start, end, service_type=None):
+        rows = [row for row in self.logs if start <= row[0] < end and service_type in (None, row[3])]
+        return {
+            'requests': len(rows),
+            'successful_requests': sum(1 for row in rows if row[2]),
+            'characters': sum(row[1] for row in rows),
+            'processing_time': timedelta(seconds=len(rows)),
+        }
+
+    def assertTotals(self, start, end, service_type=None):
+        self.assertEqual(
+            get_usage_totals(self.user, start, end, service_type=service_type),
+            self.expected(start, end, service_type),
+            msg=f"{start} - {end}"
+        )
+
+    def seed(self):
+        # Spread over three days, on both sides of hour and day boundaries
+        for day in (1, 2, 3):
+            for hour, minute in ((0, 5), (0, 55), (5, 29), (5, 31), (11, 59), (12, 0), (18, 45), (23, 59)):
+                self.log(utc(hour, minute, day), characters=hour + minute, success=minute % 2 == 0,
+                         service_type='ai_detection' if hour == 5 else 'text_humanization')
+
+    def test_totals_without_compaction(self):
+        self.seed()
+        self.assertTotals(utc(0), utc(0, day=4))
+        self.assertTotals(utc(5), utc(12, 30, day=2), service_type='ai_detection')
+
+    def test_totals_across_rollups_and_live_tail(self):
+        self.seed()
+        compact_usage(lag=timedelta(0), now=utc(12, 20, day=2))
+        ranges = [
+            (utc(0), utc(0, day=4)),
+            (utc(5), utc(12, 10, day=2)),            # ends just before the watermark
+            (utc(5), utc(12, 30, day=2)),            # ends in the watermark's hour
+            (utc(11), utc(18, 50, day=3)),           # whole days in the middle
+            (utc(0, day=2), utc(0, day=3)),          # exactly one day
+            (utc(5, day=2), utc(5, 30, day=2)),      # inside one hour
+        ]
+        for start, end in ranges:
+            self.assertTotals(start, end)
+            self.assertTotals(start, end, service_type='ai_detection')
+
+        # A second run only folds in the new window, and the totals stay the same
+        compact_usage(lag=timedelta(0), now=utc(0, day=4))
+        for start, end in ranges:
+            self.assertTotals(start, end)
+
+    def test_totals_with_compaction_lag(self):
+        self.seed()
+        compact_usage(lag=timedelta(minutes=30), now=utc(6, day=3))
+        self.assertTotals(utc(0), utc(6, day=3))
+        self.assertTotals(utc(0, day=2), utc(5, 45, day=3))
+
+    @override_settings(TIME_ZONE='Asia/Kolkata')
+    def test_totals_in_a_half_hour_time_zone(self):
+        # Hourly rollups start at :30 UTC here, so boundaries must be floored in local time
+        for hour, minute in ((9, 50), (10, 10), (10, 40), (11, 5), (11, 20), (11, 50)):
+            self.log(utc(hour, minute))
+        compact_usage(lag=timedelta(0), now=utc(12))
+        self.assertTotals(utc(9), utc(11, 10))
+        self.assertTotals(utc(10, 30), utc(11, 30))
+        self.assertTotals(utc(0), utc(13))
+        self.assertEqual(get_usage_totals(self.user, utc(9), utc(11, 10))['requests'], 4)
+
+    def test_daily_usage_includes_the_current_day(self):
+        self.seed()
+        compact_usage(lag=timedelta(0), now=utc(0, day=4))
+        days = get_usage(self.user, utc(0), utc(12, day=3))
+        self.assertEqual(sorted({row['period'].day for row in days}), [1, 2, 3])
+        self.assertEqual(sum(row['requests'] for row in days), 24)
+        self.assertEqual(get_usage(self.user, utc(0), utc(0, day=3))[-1]['period'].day, 2)
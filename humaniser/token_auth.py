@@ -0,0 +1,152 @@
+"""
+Token Auth
+Local Supabase JWT verification with a bounded cache of validated tokens
+
+Framework-free (no Django imports), so the AI API uses it as well as the
+Django app.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import jwt
+except ImportError:
+    jwt = None
+
+class InvalidToken(Exception):
+    """The token failed verification"""
+
+class TokenCache:
+    """
+    Bounded, thread-safe cache of validated token claims.
+
+    Entries are keyed by the token's SHA-256 so raw tokens are never kept,
+    expire after ttl seconds or at the token's own expiry (whichever is
+    first), and the least recently used entry is evicted when full.
+    """
+
+    def __init__(self, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(token):
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token):
+        """Return the cached claims for a token, or None"""
+        key = self.key_for(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def set(self, token, claims, expires_at=None):
+        """Cache claims until the earlier of the cache TTL and expires_at (a Unix timestamp)"""
+        now = time.time()
+        expires_at = min(now + self.ttl, expires_at if expires_at is not None else float('inf'))
+        if expires_at <= now:
+            return
+        key = self.key_for(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, token):
+        """Forget a token, e.g. after it has been revoked"""
+        with self._lock:
+            self._entries.pop(self.key_for(token), None)
+
+    def __len__(self):
+        return len(self._entries)
+
+class TokenVerifier:
+    """
+    Verifies Supabase access tokens, locally where possible.
+
+    HS256 tokens are checked against the project's JWT secret (signature,
+    expiry and audience) without any network call. The remote check is only
+    used when local verification is not possible: PyJWT is not installed, no
+    secret is configured, or the token is signed with another algorithm.
+    Successful validations from either path are cached.
+    """
+
+    def __init__(self, secret, remote_verify=None, audience='authenticated', cache=None):
+        """
+        Args:
+            secret: The Supabase project's JWT secret
+            remote_verify: Optional function taking a token and returning its
+                claims (e.g. from the auth server), raising on invalid tokens
+            audience: Expected 'aud' claim, or None to skip the check
+            cache: Cache for validated tokens: a TokenCache, or any object
+                with the same get/set/discard methods
+        """
+        self.secret = secret
+        self.remote_verify = remote_verify
+        self.audience = audience
+        self.cache = cache if cache is not None else TokenCache()
+
+    def can_verify_locally(self, token):
+        if jwt is None or not self.secret:
+            return False
+        try:
+            return jwt.get_unverified_header(token).get('alg') == 'HS256'
+        except jwt.InvalidTokenError as e:
+            raise InvalidToken(str(e))
+
+    def verify(self, token):
+        """Return (claims, source) for a valid token, source being 'cache', 'local' or 'remote'.
+
+        Raises InvalidToken if the token is invalid or expired.
+        """
+        claims = self.cache.get(token)
+        if claims is not None:
+            return claims, 'cache'
+
+        if self.can_verify_locally(token):
+            try:
+                claims = jwt.decode(
+                    token, self.secret,
+                    algorithms=['HS256'],
+                    audience=self.audience,
+                    options={'require': ['exp', 'sub'], 'verify_aud': self.audience is not None}
+                )
+            except jwt.InvalidTokenError as e:
+                raise InvalidToken(str(e))
+            self.cache.set(token, claims, expires_at=claims['exp'])
+            return claims, 'local'
+
+        if self.remote_verify is None:
+            raise InvalidToken("Token cannot be verified")
+        try:
+            claims = dict(self.remote_verify(token))
+        except Exception as e:
+            raise InvalidToken(str(e))
+        expires_at = self._unverified_expiry(token)
+        if expires_at is not None:
+            claims.setdefault('exp', expires_at)
+        self.cache.set(token, claims, expires_at=expires_at)
+        return claims, 'remote'
+
+    @staticmethod
+    def _unverified_expiry(token):
+        # Only used to bound the cache lifetime of a token the auth server accepted
+        if jwt is None:
+            return None
+        try:
+            return jwt.decode(token, options={'verify_signature': False}).get('exp')
+        except jwt.InvalidTokenError:
+            return None
@@ -0,0 +1,142 @@
+"""
+Usage Logging - buffered, bulk-inserted UsageLog writer
+"""
+import atexit
+import threading
+import time
+import logging
+from collections import deque
+from typing import Dict, Any
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .flushers import PeriodicFlusher
+
+logger = logging.getLogger(__name__)
+
+class UsageLogWriter(PeriodicFlusher):
+    """
+    Collects UsageLog records off the request path and writes them in bulk.
+
+    record() only appends to a bounded ring buffer; a background thread
+    writes the buffer with bulk_create once batch_size records are waiting
+    or flush_interval seconds have passed. When the buffer is full the
+    oldest records are dropped (and counted) rather than blocking requests.
+    A batch that fails to write goes back to the front of the buffer, as far
+    as there is room, and is retried on the next flush. Pending records are
+    flushed when the process exits.
+
+    created_at is set in record(), so rows carry the time of the request
+    rather than of the flush.
+    """
+
+    thread_name = "usage-log-writer"
+
+    def __init__(self, capacity: int = 10000, batch_size: int = 500, flush_interval: float = 2.0):
+        """
+        Args:
+            capacity: Maximum number of records held in memory
+            batch_size: Records per bulk_create, and the backlog that triggers a flush
+            flush_interval: Maximum seconds between flushes
+        """
+        super().__init__(flush_interval)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self._buffer = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "flushes": 0,
+            "high_water_mark": 0,
+            "last_flush_duration": 0.0,
+        }
+        atexit.register(self.stop)
+
+    def record(self, user_id, subscription_id, service_type: str, characters_processed: int,
+               processing_time=None, ip_address: str = None, user_agent: str = "",
+               success: bool = True, error_message: str = "", metadata: Dict[str, Any] = None):
+        """Queue one usage record; never touches the database"""
+        entry = {
+            "user_id": user_id,
+            "subscription_id": subscription_id,
+            "service_type": service_type,
+            "characters_processed": characters_processed,
+            "processing_time": processing_time,
+            "ip_address": ip_address,
+            "user_agent": user_agent or "",
+            "success": success,
+            "error_message": error_message or "",
+            "metadata": metadata or {},
+            "created_at": timezone.now(),
+        }
+        with self._lock:
+            if len(self._buffer) == self.capacity:
+                self._stats["dropped"] += 1
+            self._buffer.append(entry)
+            self._stats["enqueued"] += 1
+            backlog = len(self._buffer)
+            self._stats["high_water_mark"] = max(self._stats["high_water_mark"], backlog)
+
+        self._ensure_thread()
+        if backlog >= self.batch_size:
+            self.wake()
+
+    def flush(self) -> int:
+        """Write every buffered record now; returns the number written"""
+        from .payment_models import UsageLog
+
+        written = 0
+        with self._flush_lock:
+            start_time = time.monotonic()
+            close_old_connections()
+            try:
+                while True:
+                    with self._lock:
+                        batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                    if not batch:
+                        break
+                    try:
+                        UsageLog.objects.bulk_create([UsageLog(**entry) for entry in batch], batch_size=self.batch_size)
+                        written += len(batch)
+                    except Exception as e:
+                        logger.error(f"Failed to write {len(batch)} usage logs: {e}")
+                        self._requeue(batch)
+                        break
+            finally:
+                close_old_connections()
+            with self._lock:
+                self._stats["written"] += written
+                self._stats["flushes"] += 1
+                self._stats["last_flush_duration"] = round(time.monotonic() - start_time, 6)
+        return written
+
+    def _requeue(self, batch):
+        # Oldest first at the front; records that no longer fit are dropped
+        with self._lock:
+            self._stats["failed"] += len(batch)
+            room = self.capacity - len(self._buffer)
+            kept = batch[len(batch) - room:] if room < len(batch) else batch
+            self._stats["dropped"] += len(batch) - len(kept)
+            self._buffer.extendleft(reversed(kept))
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffer occupancy and throughput counters"""
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "buffered": len(self._buffer),
+                **self._stats,
+            }
+
+# Global instance
+usage_log_writer = UsageLogWriter(
+    capacity=getattr(settings, 'USAGE_LOG_BUFFER_SIZE', 10000),
+    batch_size=getattr(settings, 'USAGE_LOG_BATCH_SIZE', 500),
+    flush_interval=getattr(settings, 'USAGE_LOG_FLUSH_INTERVAL', 2.0),
+)
@@ -0,0 +1,248 @@
+"""
+Usage Rollups - incremental compaction of UsageLog into hourly/daily totals, and queries over them
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .payment_models import UsageLog, UsageHourlyRollup, UsageDailyRollup, UsageRollupState
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = 'usage'
+# Rows younger than this are left for the next run, so writes still in flight are not missed
+DEFAULT_COMPACTION_LAG = timedelta(seconds=getattr(settings, 'USAGE_ROLLUP_LAG', 120))
+
+def _floor_hour(value: datetime) -> datetime:
+    # In the current time zone, like TruncHour, so boundaries line up with the hourly rollup rows
+    return timezone.localtime(value).replace(minute=0, second=0, microsecond=0)
+
+def _floor_day(value: datetime) -> datetime:
+    return timezone.localtime(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _totals(rows) -> Dict[str, Any]:
+    return {
+        'requests': rows.get('request_count') or 0,
+        'successful_requests': rows.get('success_count') or 0,
+        'characters': rows.get('characters_processed') or 0,
+        'processing_time': rows.get('processing_time') or timedelta(0),
+    }
+
+def compact_usage(lag: timedelta = DEFAULT_COMPACTION_LAG, now: datetime = None) -> Dict[str, Any]:
+    """
+    Fold UsageLog rows created since the last run into the hourly and daily rollups
+
+    Each run aggregates only the new window of UsageLog (one GROUP BY) and
+    adds the totals to existing rollup rows with F() expressions, so the
+    cost is proportional to new usage. Concurrent runs are serialized on the
+    state row.
+
+    Args:
+        lag: Leave rows younger than this for the next run
+        now: Current time (for testing)
+
+    Returns:
+        Dict with the compacted window and the number of rollup rows touched
+    """
+    until = (now or timezone.now()) - lag
+
+    with transaction.atomic():
+        state = UsageRollupState.objects.select_for_update().filter(name=STATE_NAME).first()
+        if state is None:
+            first_log = UsageLog.objects.order_by('created_at').values_list('created_at', flat=True).first()
+            state, _ = UsageRollupState.objects.get_or_create(
+                name=STATE_NAME,
+                defaults={'compacted_until': _floor_hour(first_log) if first_log else until}
+            )
+            state = UsageRollupState.objects.select_for_update().get(pk=state.pk)
+
+        since = state.compacted_until
+        if since >= until:
+            return {'since': since, 'until': since, 'hourly_rows': 0, 'daily_rows': 0}
+
+        groups = (
+            UsageLog.objects
+            .filter(created_at__gte=since, created_at__lt=until)
+            .annotate(period_start=TruncHour('created_at'))
+            .values('user_id', 'service_type', 'period_start')
+            .annotate(
+                request_count=Count('id'),
+                success_count=Count('id', filter=Q(success=True)),
+                characters_processed=Sum('characters_processed'),
+                processing_time=Sum('processing_time'),
+            )
+        )
+
+        daily = defaultdict(lambda: [0, 0, 0, timedelta(0)])
+        hourly_rows = 0
+        for group in groups:
+            totals = [
+                group['request_count'],
+                group['success_count'],
+                group['characters_processed'] or 0,
+                group['processing_time'] or timedelta(0),
+            ]
+            _add_to_rollup(
+                UsageHourlyRollup,
+                {'user_id': group['user_id'], 'service_type': group['service_type'], 'period_start': group['period_start']},
+                totals
+            )
+            hourly_rows += 1
+            day = daily[(group['user_id'], group['service_type'], timezone.localdate(group['period_start']))]
+            for index, value in enumerate(totals):
+                day[index] += value
+
+        for (user_id, service_type, day), totals in daily.items():
+            _add_to_rollup(UsageDailyRollup, {'user_id': user_id, 'service_type': service_type, 'day': day}, totals)
+
+        state.compacted_until = until
+        state.save(update_fields=['compacted_until', 'updated_at'])
+
+    logger.info(f"Compacted usage from {since} to {until}: {hourly_rows} hourly, {len(daily)} daily rollups")
+    return {'since': since, 'until': until, 'hourly_rows': hourly_rows, 'daily_rows': len(daily)}
+
+def _add_to_rollup(model, key: Dict[str, Any], totals: List[Any]):
+    request_count, success_count, characters_processed, processing_time = totals
+    updated = model.objects.filter(**key).update(
+        request_count=F('request_count') + request_count,
+        success_count=F('success_count') + success_count,
+        characters_processed=F('characters_processed') + characters_processed,
+        processing_time=F('processing_time') + processing_time,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        model.objects.create(
+            **key,
+            request_count=request_count,
+            success_count=success_count,
+            characters_processed=characters_processed,
+            processing_time=processing_time,
+        )
+
+def compacted_until() -> Optional[datetime]:
+    """UsageLog rows created before this time are included in the rollups"""
+    return UsageRollupState.objects.filter(name=STATE_NAME).values_list('compacted_until', flat=True).first()
+
+def get_usage_totals(user, start: datetime, end: datetime = None, service_type: str = None) -> Dict[str, Any]:
+    """
+    Total usage for a user between start and end
+
+    Whole days are read from the daily rollups, the partial days at either
+    edge from the hourly rollups, and only the UsageLog rows not compacted
+    yet are scanned, so the cost is O(days) rather than O(requests).
+
+    Args:
+        user: User (or user id)
+        start: Start of the range (rounded down to the hour)
+        end: End of the range, exclusive (default: now)
+        service_type: Only count this service
+
+    Returns:
+        Dict with requests, successful_requests, characters and processing_time
+    """
+    user_id = getattr(user, 'pk', user)
+    start = _floor_hour(start)
+    end = end or timezone.now()
+    filters = {'user_id': user_id}
+    if service_type:
+        filters['service_type'] = service_type
+
+    parts = []
+    watermark = compacted_until() or start
+    # An hourly row may hold usage up to the watermark, so stop at a whole hour before it
+    rolled_up_until = watermark if watermark <= end else _floor_hour(end)
+    if rolled_up_until > start:
+        first_day = _floor_day(start)
+        if first_day < start:
+            first_day += timedelta(days=1)
+        last_day = _floor_day(rolled_up_until)
+        if first_day < last_day:
+            parts.append(UsageDailyRollup.objects.filter(
+                **filters, day__gte=first_day.date(), day__lt=last_day.date()
+            ))
+            hourly_ranges = [(start, first_day), (last_day, rolled_up_until)]
+        else:
+            hourly_ranges = [(start, rolled_up_until)]
+        for range_start, range_end in hourly_ranges:
+            if range_start < range_end:
+                parts.append(UsageHourlyRollup.objects.filter(
+                    **filters, period_start__gte=range_start, period_start__lt=range_end
+                ))
+
+    totals = {'requests': 0, 'successful_requests': 0, 'characters': 0, 'processing_time': timedelta(0)}
+    for queryset in parts:
+        part = _totals(queryset.aggregate(
+            request_count=Sum('request_count'),
+            success_count=Sum('success_count'),
+            characters_processed=Sum('characters_processed'),
+            processing_time=Sum('processing_time'),
+        ))
+        for key in totals:
+            totals[key] += part[key]
+
+    # Usage not compacted yet
+    recent_start = max(start, rolled_up_until)
+    if recent_start < end:
+        part = _totals(UsageLog.objects.filter(
+            **filters, created_at__gte=recent_start, created_at__lt=end
+        ).aggregate(
+            request_count=Count('id'),
+            success_count=Count('id', filter=Q(success=True)),
+            characters_processed=Sum('characters_processed'),
+            processing_time=Sum('processing_time'),
+        ))
+        for key in totals:
+            totals[key] += part[key]
+    return totals
+
+def get_usage(user, start: datetime, end: datetime = None, granularity: str = 'day',
+              service_type: str = None) -> List[Dict[str, Any]]:
+    """
+    Compacted usage for a user per period and service type, e.g. for billing charts
+
+    Args:
+        user: User (or user id)
+        start: Start of the range
+        end: End of the range, exclusive (default: now)
+        granularity: 'day' or 'hour'
+        service_type: Only include this service
+
+    Returns:
+        List of dicts with period, service_type and the totals, oldest first
+    """
+    user_id = getattr(user, 'pk', user)
+    end = end or timezone.now()
+    if granularity == 'day':
+        # Include the (possibly partial) day containing the exclusive end
+        last_day = timezone.localdate(end - timedelta(microseconds=1))
+        queryset = UsageDailyRollup.objects.filter(
+            user_id=user_id, day__gte=timezone.localdate(start), day__lte=last_day
+        ).order_by('day', 'service_type')
+        period_field = 'day'
+    elif granularity == 'hour':
+        queryset = UsageHourlyRollup.objects.filter(
+            user_id=user_id, period_start__gte=_floor_hour(start), period_start__lt=end
+        ).order_by('period_start', 'service_type')
+        period_field = 'period_start'
+    else:
+        raise ValueError("granularity must be 'day' or 'hour'")
+
+    if service_type:
+        queryset = queryset.filter(service_type=service_type)
+    return [
+        {
+            'period': row[period_field],
+            'service_type': row['service_type'],
+            **_totals(row),
+        }
+        for row in queryset.values(
+            period_field, 'service_type', 'request_count', 'success_count', 'characters_processed', 'processing_time'
+        )
+    ]
@@ -0,0 +1,300 @@
+"""
+Job Queue
+SQLite-backed queue for humanizing large documents outside the API request workers
+
+Usage:
+  python job_queue.py                 # Start one worker per CPU
+  python job_queue.py --workers 4     # Start 4 worker processes
+"""
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from contextlib import closing
+from datetime import datetime
+
+JOB_DB_PATH = os.environ.get("AI_JOB_DB_PATH", "ai_humaniser_jobs.sqlite3")
+JOB_POLL_INTERVAL = float(os.environ.get("AI_JOB_POLL_INTERVAL", 0.5))
+# Jobs left 'running' longer than this by a worker that no longer exists are queued again
+JOB_STALE_AFTER = int(os.environ.get("AI_JOB_STALE_AFTER", 3600))
+# A job whose worker dies this many times is marked failed instead of retried
+JOB_MAX_ATTEMPTS = int(os.environ.get("AI_JOB_MAX_ATTEMPTS", 3))
+# How often the worker supervisor replaces dead workers and requeues stale jobs
+JOB_SUPERVISE_INTERVAL = float(os.environ.get("AI_JOB_SUPERVISE_INTERVAL", 5))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    text TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    worker_pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+# Columns added after the first release, created on databases that predate them
+ADDED_COLUMNS = {
+    'owner': 'TEXT',
+    'worker_pid': 'INTEGER',
+}
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+def _process_alive(pid):
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobStore:
+    """Durable job table shared by the API (submit/poll) and the worker processes (claim/finish)"""
+
+    def __init__(self, path=JOB_DB_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            existing = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def submit(self, text, owner=None):
+        """Queue text for processing on behalf of owner (a user id) and return the new job id"""
+        job_id = uuid.uuid4().hex
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, text, owner, created_at) VALUES (?, 'queued', ?, ?, ?)",
+                (job_id, text, owner, time.time())
+            )
+        return job_id
+
+    def get(self, job_id, owner=None):
+        """Return the status of owner's job (without its text or result), or None if unknown"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, status, error, attempts, created_at, started_at, finished_at, "
+                "length(text) AS characters FROM jobs WHERE id = ? AND owner IS ?",
+                (job_id, owner)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'job_id': row['id'],
+            'status': row['status'],
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'characters': row['characters'],
+            'created_at': _isoformat(row['created_at']),
+            'started_at': _isoformat(row['started_at']),
+            'finished_at': _isoformat(row['finished_at']),
+        }
+
+    def get_result(self, job_id, owner=None):
+        """Return (text, result) for owner's completed job, or None"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT text, result FROM jobs WHERE id = ? AND owner IS ? AND status = 'completed'",
+                (job_id, owner)
+            ).fetchone()
+        if row is None:
+            return None
+        return row['text'], json.loads(row['result'])
+
+    def claim(self, worker_pid=None):
+        """Atomically move the oldest queued job to 'running' and return (id, text)"""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, text FROM jobs WHERE status = 'queued' "
+                    "ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ?, worker_pid = ?, "
+                        "attempts = attempts + 1 WHERE id = ?",
+                        (time.time(), worker_pid, row['id'])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row['id'], row['text']
+
+    def complete(self, job_id, result, worker_pid=None):
+        """Store the result of a finished job; False if the job was requeued and is no longer this worker's"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'completed', result = ?, finished_at = ? "
+                "WHERE id = ? AND status = 'running' AND worker_pid IS ?",
+                (json.dumps(result), time.time(), job_id, worker_pid)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, error, worker_pid=None):
+        """Mark a job as failed; False if the job was requeued and is no longer this worker's"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+                "WHERE id = ? AND status = 'running' AND worker_pid IS ?",
+                (error, time.time(), job_id, worker_pid)
+            )
+        return cursor.rowcount == 1
+
+    def requeue_stale(self, stale_after=JOB_STALE_AFTER, max_attempts=JOB_MAX_ATTEMPTS):
+        """
+        Queue again jobs running for longer than stale_after whose worker
+        process is gone; returns how many were requeued. Jobs whose worker is
+        still alive are left alone, however long they take, so a job never
+        runs twice at the same time.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, worker_pid FROM jobs WHERE status = 'running' AND started_at < ?",
+                (time.time() - stale_after,)
+            ).fetchall()
+        orphaned = [(row['id'], row['worker_pid']) for row in rows if not _process_alive(row['worker_pid'])]
+        if not orphaned:
+            return 0
+        condition = "(" + " OR ".join(["(id = ? AND worker_pid IS ?)"] * len(orphaned)) + ")"
+        return self._requeue(condition, tuple(value for job in orphaned for value in job), max_attempts)
+
+    def requeue_worker(self, worker_pid, max_attempts=JOB_MAX_ATTEMPTS):
+        """Queue again the job a dead worker was running; returns how many were requeued"""
+        return self._requeue("worker_pid = ?", (worker_pid,), max_attempts)
+
+    def _requeue(self, condition, params, max_attempts):
+        # Jobs that already used up their attempts (e.g. a document that keeps
+        # getting its worker OOM-killed) fail instead of going round again
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', worker_pid = NULL, finished_at = ?, "
+                    "error = 'Worker died while processing the job (' || attempts || ' attempts)' "
+                    f"WHERE status = 'running' AND attempts >= ? AND {condition}",
+                    (time.time(), max_attempts, *params)
+                )
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = 'queued', started_at = NULL, worker_pid = NULL "
+                    f"WHERE status = 'running' AND {condition}",
+                    params
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return cursor.rowcount
+
+    def counts(self):
+        """Return the number of jobs per status"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS total FROM jobs GROUP BY status").fetchall()
+        return {row['status']: row['total'] for row in rows}
+
+def worker_loop(path=JOB_DB_PATH, poll_interval=JOB_POLL_INTERVAL):
+    """Process queued jobs forever; the NLTK model is loaded once per worker process"""
+    from standalone_ai_model import run_pipeline
+
+    store = JobStore(path)
+    worker_pid = os.getpid()
+    while True:
+        job = store.claim(worker_pid)
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+
+        job_id, text = job
+        try:
+            result = run_pipeline(text)
+            finished = store.complete(job_id, {
+                'humanized_text': result['humanized_text'],
+                'final_text': result['final_text'],
+                'ai_detection': result['ai_detection'],
+                'word_count': result['word_count'],
+                'changes': result['changes'],
+                'processing_time': round(result['processing_time'], 3),
+            }, worker_pid)
+        except Exception as e:
+            finished = store.fail(job_id, str(e), worker_pid)
+        if not finished:
+            print(f"⚠️ Job {job_id} was requeued while worker {worker_pid} ran it; result discarded")
+
+def run_workers(processes, path=JOB_DB_PATH, supervise_interval=JOB_SUPERVISE_INTERVAL):
+    """Start worker processes and keep them running, replacing any that die"""
+    # Load the model before forking so every worker shares it
+    from standalone_ai_model import warm_up
+    print(f"🔥 Model warmed up in {warm_up():.3f} seconds")
+
+    store = JobStore(path)
+    requeued = store.requeue_stale()
+    if requeued:
+        print(f"♻️ Requeued {requeued} stale job(s)")
+
+    def start_worker():
+        worker = multiprocessing.Process(target=worker_loop, args=(path,), daemon=True)
+        worker.start()
+        return worker
+
+    workers = [start_worker() for _ in range(processes)]
+    print(f"👷 Started {processes} job worker(s) on {path}")
+
+    try:
+        while True:
+            time.sleep(supervise_interval)
+            for index, worker in enumerate(workers):
+                if worker.is_alive():
+                    continue
+                # e.g. OOM-killed on a large document: retry its job, then replace it
+                requeued = store.requeue_worker(worker.pid)
+                print(f"💀 Worker {worker.pid} exited with code {worker.exitcode}; "
+                      f"requeued {requeued} job(s), starting a replacement")
+                workers[index] = start_worker()
+            requeued = store.requeue_stale()
+            if requeued:
+                print(f"♻️ Requeued {requeued} stale job(s)")
+    except KeyboardInterrupt:
+        print("👋 Stopping job workers")
+        for worker in workers:
+            worker.terminate()
+
+def main():
+    """Main function"""
+    processes = os.cpu_count() or 1
+    if len(sys.argv) > 1:
+        if sys.argv[1] == '--workers' and len(sys.argv) > 2:
+            processes = int(sys.argv[2])
+        else:
+            print("Usage:")
+            print("  python job_queue.py                 # One worker per CPU")
+            print("  python job_queue.py --workers <n>   # Start n worker processes")
+            return
+    run_workers(processes)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Lexicon Matcher
+Word-level Aho-Corasick automaton for finding AI-style phrases in a single pass
+"""
+
+from collections import deque
+
+from text_analysis import tokenize_words
+
+FORMAL_PHRASES = (
+    'furthermore',
+    'moreover',
+    'consequently',
+    'thus',
+    'therefore',
+)
+
+JARGON_PHRASES = (
+    'implementation',
+    'methodology',
+    'framework',
+    'optimization',
+    'algorithm',
+)
+
+def normalize_word(word):
+    """
+    Strip plural and possessive endings so inflected forms match their lexicon
+    entry ("frameworks" -> "framework", "methodologies" -> "methodology").
+    Applied to lexicon phrases and scanned words alike, so it only has to be
+    consistent, not linguistically exact.
+    """
+    if word.endswith("'s"):
+        word = word[:-2]
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if (len(word) > 4 and word.endswith('es') and word[-3] in 'sxz') or word.endswith(('ches', 'shes')):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+class PhraseMatcher:
+    """
+    Multi-phrase matcher over word tokens.
+
+    Phrases are compiled once into an Aho-Corasick automaton whose edges are
+    whole (normalized) words, so a phrase only matches on word boundaries
+    ("thus" does not match inside "enthusiast") but still matches its plural
+    forms, and a scan costs one step per word regardless of how many phrases
+    are registered.
+    """
+
+    def __init__(self, lexicons):
+        """
+        Args:
+            lexicons: Mapping of category name to an iterable of phrases
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        self.categories = tuple(lexicons)
+
+        for category, phrases in lexicons.items():
+            for phrase in phrases:
+                self._add(phrase.lower(), category)
+        self._link()
+
+    def _add(self, phrase, category):
+        words = [normalize_word(word) for word in tokenize_words(phrase)]
+        if not words:
+            return
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((phrase, len(words), category))
+
+    def _link(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(word, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def finditer(self, words):
+        """Yield (start, phrase, category) for every phrase occurrence in a word sequence"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for index, word in enumerate(words):
+            word = normalize_word(word)
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for phrase, length, category in outputs[state]:
+                yield index - length + 1, phrase, category
+
+    def distinct_matches(self, words):
+        """Return the set of distinct phrases found per category"""
+        found = {category: set() for category in self.categories}
+        for _, phrase, category in self.finditer(words):
+            found[category].add(phrase)
+        return found
+
+# Built once at import and shared by every detection call
+AI_PHRASE_MATCHER = PhraseMatcher({
+    'formal': FORMAL_PHRASES,
+    'jargon': JARGON_PHRASES,
+})
@@ -0,0 +1,181 @@
+"""
+Metrics
+In-process request and pipeline stage metrics, served as JSON and in the Prometheus text format
+"""
+
+import bisect
+import threading
+import time
+
+# Latency histogram bucket upper bounds in seconds: 0.1ms to ~52s, each sqrt(2) wider than the last
+LATENCY_BUCKETS = tuple(round(0.0001 * 2 ** (i / 2), 7) for i in range(39))
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+class _Shard:
+    """Counters and histograms written by a single thread"""
+
+    def __init__(self):
+        self.counters = {}
+        # (name, labels) -> [count per bucket..., count above the last bucket, sum]
+        self.histograms = {}
+
+    def merge(self, other):
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, values in other.histograms.items():
+            mine = self.histograms.get(key)
+            if mine is None:
+                self.histograms[key] = list(values)
+            else:
+                for index, value in enumerate(values):
+                    mine[index] += value
+
+class HistogramSnapshot:
+    """Point-in-time copy of one histogram"""
+
+    def __init__(self, buckets, values):
+        self.buckets = buckets
+        self.counts = values[:-1]
+        self.sum = values[-1]
+        self.count = sum(self.counts)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation within its bucket (like Prometheus' histogram_quantile)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    # Above the last bucket: the best bound we have
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 6),
+            'p50': round(self.quantile(0.50), 6),
+            'p95': round(self.quantile(0.95), 6),
+            'p99': round(self.quantile(0.99), 6),
+        }
+
+class MetricsRegistry:
+    """
+    Counters and latency histograms for one process.
+
+    Every thread records into its own shard, so recording takes no lock;
+    readers add the shards up. Shards of threads that have exited are folded
+    into a single retired shard when a snapshot is taken.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def increment(self, name, amount=1, **labels):
+        """Add amount to a counter"""
+        counters = self._shard().counters
+        key = (name, _labels(labels))
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        """Record one value (e.g. a duration in seconds) in a histogram"""
+        histograms = self._shard().histograms
+        key = (name, _labels(labels))
+        values = histograms.get(key)
+        if values is None:
+            values = histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def _snapshot(self):
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._retired.merge(shard)
+            self._shards = live
+
+            total = _Shard()
+            total.merge(self._retired)
+            for _, shard in live:
+                snapshot = _Shard()
+                snapshot.counters = shard.counters.copy()
+                snapshot.histograms = {key: list(values) for key, values in shard.histograms.copy().items()}
+                total.merge(snapshot)
+        return total
+
+    def counters(self):
+        """Return {(name, labels): total} summed over all threads"""
+        return self._snapshot().counters
+
+    def histograms(self):
+        """Return {(name, labels): HistogramSnapshot} summed over all threads"""
+        return {
+            key: HistogramSnapshot(self.buckets, values)
+            for key, values in self._snapshot().histograms.items()
+        }
+
+    def render_prometheus(self, prefix='ai_humaniser_'):
+        """Return all metrics in the Prometheus text exposition format"""
+        snapshot = self._snapshot()
+        lines = []
+
+        for name in sorted({name for name, _ in snapshot.counters}):
+            lines.append(f"# TYPE {prefix}{name} counter")
+            for (metric, labels), value in sorted(snapshot.counters.items()):
+                if metric == name:
+                    lines.append(f"{prefix}{name}{_format_labels(labels)} {value}")
+
+        for name in sorted({name for name, _ in snapshot.histograms}):
+            lines.append(f"# TYPE {prefix}{name} histogram")
+            for (metric, labels), values in sorted(snapshot.histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets, values):
+                    cumulative += count
+                    lines.append(f"{prefix}{name}_bucket{_format_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                cumulative += values[-2]
+                lines.append(f"{prefix}{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {cumulative}")
+                lines.append(f"{prefix}{name}_sum{_format_labels(labels)} {values[-1]}")
+                lines.append(f"{prefix}{name}_count{_format_labels(labels)} {cumulative}")
+
+        lines.append(f"# TYPE {prefix}process_start_time_seconds gauge")
+        lines.append(f"{prefix}process_start_time_seconds {self.started_at}")
+        return '\n'.join(lines) + '\n'
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
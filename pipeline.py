@@ -0,0 +1,220 @@
+"""
+Text Pipeline
+Declarative, ordered processing stages with per-stage timing and per-request stage selection
+"""
+
+import threading
+import time
+from collections.abc import Mapping
+
+from text_analysis import AnalyzedText
+
+# Callables taking (stage_name, seconds), called in this process whenever a stage runs
+_stage_timing_hooks = []
+
+def add_stage_timing_hook(hook):
+    """Register a callable to be told how long each stage took (e.g. to feed metrics)"""
+    _stage_timing_hooks.append(hook)
+
+def _report_stage_timing(name, seconds):
+    for hook in _stage_timing_hooks:
+        hook(name, seconds)
+
+class PipelineContext:
+    """State handed from stage to stage during one pipeline run"""
+
+    def __init__(self, text, options):
+        self.original_text = text
+        self.doc = AnalyzedText(text)
+        self.text = text
+        self.options = options
+        self.values = {}
+        self.timings = {}
+        self.changes = {}
+        self.stages_run = []
+
+    def __getstate__(self):
+        # Per-run options (e.g. a sentence cache) stay in the process that ran the pipeline
+        state = self.__dict__.copy()
+        state['options'] = {}
+        return state
+
+class PipelineResult(Mapping):
+    """
+    Read-only, dict-compatible result of a pipeline run.
+
+    Fields produced by lazy stages are computed from the run's context the
+    first time they are read and kept afterwards, so callers that never read
+    them never pay for them; their timing is added to 'stage_timings' then.
+    Membership tests and key listings do not trigger the computation.
+
+    Results are shared between request threads (e.g. through the result
+    cache), so a lazy field is computed once under a lock, and
+    'stage_timings' is returned as a fresh dict on every read.
+    """
+
+    def __init__(self, values, lazy=None):
+        self._values = dict(values)
+        # key -> (stage name, stage run function, PipelineContext)
+        self._lazy = dict(lazy or {})
+        self._lazy_timings = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        if key == 'stage_timings' and key in self._values:
+            with self._lock:
+                return {**self._values[key], **self._lazy_timings}
+        if key in self._values:
+            return self._values[key]
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            if key not in self._lazy:
+                raise KeyError(key)
+            name, run, context = self._lazy[key]
+            stage_start = time.time()
+            value = run(context)
+            elapsed = time.time() - stage_start
+            self._lazy_timings[name] = elapsed
+            self._values[key] = value
+            del self._lazy[key]
+        _report_stage_timing(name, elapsed)
+        return value
+
+    def __contains__(self, key):
+        return key in self._values or key in self._lazy
+
+    def __iter__(self):
+        with self._lock:
+            keys = list(self._values) + [key for key in self._lazy if key not in self._values]
+        yield from keys
+
+    def __len__(self):
+        with self._lock:
+            return len(self._values.keys() | self._lazy.keys())
+
+    def is_computed(self, key):
+        """Whether a field has a value yet (False for lazy fields not read so far)"""
+        return key in self._values
+
+    def __repr__(self):
+        with self._lock:
+            pending = ', '.join(self._lazy)
+            values = dict(self._values)
+        if 'stage_timings' in values:
+            values['stage_timings'] = self['stage_timings']
+        return f"PipelineResult({values!r}, pending=[{pending}])"
+
+class Stage:
+    """
+    One named pipeline step.
+
+    Args:
+        name: Stage name, used to select or skip it per request
+        run: Function taking the PipelineContext and returning the stage value
+        output: Result key the value is stored under
+        transforms: Whether the value replaces the working text for later stages
+        skip_if: Optional predicate on the context; when true the stage is
+            short-circuited and a transforming stage passes the text through
+        lazy: Defer the stage until its output is read from the result. Lazy
+            stages see the context as it is at the end of the run, so they
+            cannot transform the text; their run function must be picklable
+            (defined at module level) for results to cross processes.
+    """
+
+    def __init__(self, name, run, output, transforms=True, skip_if=None, lazy=False):
+        if lazy and transforms:
+            raise ValueError(f"Lazy stage '{name}' cannot transform the text")
+        self.name = name
+        self.run = run
+        self.output = output
+        self.transforms = transforms
+        self.skip_if = skip_if
+        self.lazy = lazy
+
+class Pipeline:
+    """An ordered list of stages"""
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    @property
+    def names(self):
+        return [stage.name for stage in self.stages]
+
+    def select(self, skip=(), only=None):
+        """Return the names of the stages that would run for a skip/only selection"""
+        unknown = (set(skip) | set(only or ())) - set(self.names)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stage(s): {', '.join(sorted(unknown))}")
+        return [
+            name for name in self.names
+            if name not in skip and (only is None or name in only)
+        ]
+
+    def run(self, text, observer=None, skip=(), only=None, **options):
+        """Run the selected stages over text and return a PipelineResult.
+
+        Stages not selected (or short-circuited) cost nothing; a transforming
+        stage that does not run passes the text through unchanged, so its
+        output key is always present. Lazy stages are only registered on the
+        result and have no timing entry. Extra keyword options are available
+        to stages as context.options.
+        """
+        selected = self.select(skip, only)
+        start_time = time.time()
+        context = PipelineContext(text, options)
+        lazy = {}
+        if observer:
+            observer.on_start(text)
+
+        for stage in self.stages:
+            if stage.name not in selected:
+                if stage.transforms:
+                    context.values[stage.output] = context.text
+                continue
+
+            if stage.lazy:
+                if not (stage.skip_if and stage.skip_if(context)):
+                    lazy[stage.output] = (stage.name, stage.run, context)
+                continue
+
+            stage_start = time.time()
+            if stage.skip_if and stage.skip_if(context):
+                value = context.text if stage.transforms else None
+                context.timings[stage.name] = time.time() - stage_start
+            else:
+                value = stage.run(context)
+                context.stages_run.append(stage.name)
+                context.timings[stage.name] = time.time() - stage_start
+                _report_stage_timing(stage.name, context.timings[stage.name])
+
+            if stage.transforms:
+                context.changes[stage.name] = value != context.text
+                context.text = value
+            if value is not None:
+                context.values[stage.output] = value
+            if observer:
+                observer.on_stage(stage.name, context)
+
+        result = PipelineResult({
+            'original_text': text,
+            **context.values,
+            'word_count': context.doc.word_count,
+            'changes': context.changes,
+            'stages': context.stages_run,
+            'stage_timings': context.timings,
+            'processing_time': time.time() - start_time
+        }, lazy)
+        if observer:
+            observer.on_complete(result)
+        return result
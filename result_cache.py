@@ -0,0 +1,132 @@
+"""
+Result Cache
+Content-addressed cache for humanization and detection results
+"""
+
+import hashlib
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+
+_MISSING = object()
+
+def normalize_text(text):
+    """Normalize text so that equivalent inputs share a cache key"""
+    return unicodedata.normalize('NFC', text.replace('\r\n', '\n'))
+
+def django_cache_backend():
+    """Return Django's default cache when Django settings are available, otherwise None"""
+    if not os.environ.get('DJANGO_SETTINGS_MODULE'):
+        return None
+    try:
+        import django
+        django.setup()
+        from django.core.cache import cache
+        return cache
+    except Exception as e:
+        print(f"⚠️ Warning: Shared cache unavailable: {e}")
+        return None
+
+class ResultCache:
+    """
+    Two-tier cache keyed by a hash of the normalized input text.
+
+    The first tier is a bounded in-process LRU. The optional shared tier is
+    any object with Django's cache interface (get/set with a timeout) and is
+    consulted on local misses, so several workers can reuse each other's
+    results.
+    """
+
+    def __init__(self, max_entries=1024, version='', shared_backend=None, shared_timeout=3600):
+        self.max_entries = max_entries
+        self.version = version
+        self.shared_backend = shared_backend
+        self.shared_timeout = shared_timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._shared_errors = 0
+
+    def key_for(self, namespace, text):
+        """Build the cache key for a namespace (e.g. 'detect') and input text"""
+        digest = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+        return f"ai_humaniser:{namespace}:{self.version}:{digest}"
+
+    def get(self, namespace, text, default=None):
+        """Return the cached value for text, or default on a miss"""
+        key = self.key_for(namespace, text)
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+
+        if self.shared_backend is not None:
+            try:
+                value = self.shared_backend.get(key, _MISSING)
+            except Exception:
+                value = _MISSING
+                with self._lock:
+                    self._shared_errors += 1
+            if value is not _MISSING:
+                with self._lock:
+                    self._shared_hits += 1
+                self._store_local(key, value)
+                return value
+
+        with self._lock:
+            self._misses += 1
+        return default
+
+    def set(self, namespace, text, value):
+        """Store a value in the local tier and, if configured, the shared tier"""
+        key = self.key_for(namespace, text)
+        self._store_local(key, value)
+        if self.shared_backend is not None:
+            try:
+                self.shared_backend.set(key, value, self.shared_timeout)
+            except Exception:
+                with self._lock:
+                    self._shared_errors += 1
+
+    def get_or_compute(self, namespace, text, compute):
+        """Return the cached value for text, computing and storing it on a miss"""
+        value = self.get(namespace, text, _MISSING)
+        if value is _MISSING:
+            value = compute(text)
+            self.set(namespace, text, value)
+        return value
+
+    def clear(self):
+        """Drop all entries from the local tier"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self._hits + self._shared_hits + self._misses
+            return {
+                'hits': self._hits,
+                'shared_hits': self._shared_hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'shared_errors': self._shared_errors,
+                'hit_rate': round((self._hits + self._shared_hits) / lookups, 3) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'shared_tier': self.shared_backend is not None,
+            }
+
+    def _store_local(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
@@ -5,6 +5,8 @@ Run your AI text humanization model independently
 
 import sys
 import os
+import difflib
+import gc
 import re
 import time
 from datetime import datetime
@@ -23,6 +25,13 @@ except ImportError as e:
     print("Please ensure your AI model files are in the correct location")
     sys.exit(1)
 
+# Serve the model's WordNet lookups from the precompiled synonym index, if built
+import main as model_module
+from synonym_index import IndexedWordNet, install_synonym_index
+if install_synonym_index(model_module):
+    wordnet = model_module.wordnet
+    print("✅ Synonym index loaded")
+
 try:
     from humanize import naturalsize
     import humanize
@@ -33,70 +42,194 @@ except ImportError as e:
     def naturalsize(size):
         return f"{size} bytes"
 
+from text_analysis import analyze, split_paragraphs
+from lexicon import AI_PHRASE_MATCHER
+from pipeline import Pipeline, Stage
+
+# Bump whenever a change to the pipeline alters its output, so cached results are not reused
+PIPELINE_VERSION = '1.2.1'
+
+class NumberFormatRegistry:
+    """
+    Number formats applied in a single pass over the text.
+
+    All registered patterns are combined into one precompiled alternation,
+    so adding a format does not add another scan of the text. When several
+    formats match at the same position, the one registered first wins.
+    """
+
+    def __init__(self):
+        self._formats = []
+        self._scanner = None
+
+    def register(self, name, pattern, formatter):
+        """Register (or replace) a number format.
+
+        pattern may use unnamed groups only; their values are passed to
+        formatter as positional arguments and it returns the replacement text.
+        """
+        group_count = re.compile(pattern).groups
+        self._formats = [f for f in self._formats if f[0] != name]
+        self._formats.append((name, pattern, group_count, formatter))
+        self._scanner = None
+
+    def unregister(self, name):
+        """Remove a number format"""
+        self._formats = [f for f in self._formats if f[0] != name]
+        self._scanner = None
+
+    @property
+    def names(self):
+        return [f[0] for f in self._formats]
+
+    def _compiled(self):
+        if self._scanner is None:
+            scanner = re.compile('|'.join(
+                f"(?P<format{i}>{pattern})" for i, (_, pattern, _, _) in enumerate(self._formats)
+            ))
+            dispatch = {
+                f"format{i}": (scanner.groupindex[f"format{i}"], group_count, formatter)
+                for i, (_, _, group_count, formatter) in enumerate(self._formats)
+            }
+            self._scanner = (scanner, dispatch)
+        return self._scanner
+
+    def apply(self, text):
+        """Replace every recognised number in text"""
+        if not self._formats:
+            return text
+        scanner, dispatch = self._compiled()
+        parts = []
+        position = 0
+        for match in scanner.finditer(text):
+            # The wrapping group closes last, so lastgroup names the format
+            group_index, group_count, formatter = dispatch[match.lastgroup]
+            parts.append(text[position:match.start()])
+            parts.append(formatter(*match.groups()[group_index:group_index + group_count]))
+            position = match.end()
+        if not parts:
+            return text
+        parts.append(text[position:])
+        return ''.join(parts)
+
+def format_bytes(amount, unit):
+    """Humanize byte counts"""
+    return naturalsize(int(amount))
+
+def format_currency(amount, currency):
+    """Humanize large currency amounts (INR, USD, etc.) in lakh/crore"""
+    amount = int(amount)
+    if amount >= 10_000_000:
+        return f"{round(amount/10_000_000, 1)} crore {currency}"
+    elif amount >= 100_000:
+        return f"{round(amount/100_000, 1)} lakh {currency}"
+    else:
+        return f"{amount:,} {currency}"
+
+def format_time_ago(number, unit):
+    """Humanize time-related values"""
+    if unit.endswith('s'):
+        unit = unit[:-1]  # Remove 's' for singular
+    return f"{int(number)} {unit} ago"
+
+NUMBER_FORMATS = NumberFormatRegistry()
+NUMBER_FORMATS.register('bytes', r'(\d{5,})\s?(bytes|Byte|B)', format_bytes)
+NUMBER_FORMATS.register('currency', r'(\d{5,})(\s?INR|\s?USD|\s?Rs\.?)', format_currency)
+NUMBER_FORMATS.register('time_ago', r'(\d+)\s?(seconds?|minutes?|hours?|days?)\sago', format_time_ago)
+
+def register_number_format(name, pattern, formatter):
+    """Add a number format (e.g. percentages or dates) to humanize_numbers_in_text"""
+    NUMBER_FORMATS.register(name, pattern, formatter)
+
 def humanize_numbers_in_text(text):
     """Humanize numbers and data in text"""
     if not text:
         return text
-    
-    processed = text
-    
-    # Humanize bytes
-    processed = re.sub(r'(\d{5,})\s?(bytes|Byte|B)', 
-                      lambda m: f"{naturalsize(int(m.group(1)))}", processed)
-    
-    # Humanize large currency amounts (INR, USD, etc.)
-    def format_currency(match):
-        amount = int(match.group(1))
-        currency = match.group(2)
-        if amount >= 10_000_000:
-            return f"{round(amount/10_000_000, 1)} crore {currency}"
-        elif amount >= 100_000:
-            return f"{round(amount/100_000, 1)} lakh {currency}"
+    return NUMBER_FORMATS.apply(text)
+
+def humanize_text_incremental(text, sentence_cache):
+    """Humanize text sentence by sentence, reusing cached output for unchanged sentences.
+
+    text may be a string or an AnalyzedText. sentence_cache is a ResultCache
+    (or anything with the same get/set interface). Returns the stitched
+    humanized text and reuse statistics.
+    """
+    parts = list(analyze(text).sentence_parts)
+    reused = humanized = 0
+
+    for index in range(0, len(parts), 2):
+        sentence = parts[index]
+        if not sentence.strip():
+            continue
+        cached = sentence_cache.get('sentence', sentence)
+        if cached is not None:
+            parts[index] = cached
+            reused += 1
         else:
-            return f"{amount:,} {currency}"
-    
-    processed = re.sub(r'(\d{5,})(\s?INR|\s?USD|\s?Rs\.?)', format_currency, processed)
-    
-    # Humanize time-related values
-    def format_time(match):
-        number = int(match.group(1))
-        unit = match.group(2)
-        if unit.endswith('s'):
-            unit = unit[:-1]  # Remove 's' for singular
-        return f"{number} {unit} ago"
-    
-    processed = re.sub(r'(\d+)\s?(seconds?|minutes?|hours?|days?)\sago', format_time, processed)
-    
-    return processed
+            parts[index] = humanize_text(sentence)
+            sentence_cache.set('sentence', sentence, parts[index])
+            humanized += 1
+
+    return ''.join(parts), {
+        'sentences': reused + humanized,
+        'reused': reused,
+        'humanized': humanized
+    }
+
+def humanize_paragraph(paragraph):
+    """Humanize one paragraph: text humanization followed by number formatting"""
+    return humanize_numbers_in_text(humanize_text(paragraph))
+
+def humanize_paragraphs(text, paragraph_cache=None):
+    """Humanize text paragraph by paragraph, yielding (index, humanized_paragraph, separator).
+
+    Each paragraph is yielded as soon as it is processed, so callers can
+    stream results. separator is the whitespace that followed the paragraph
+    in the input ('' for the last one).
+    """
+    parts = split_paragraphs(text)
+    for index, position in enumerate(range(0, len(parts), 2)):
+        paragraph = parts[position]
+        separator = parts[position + 1] if position + 1 < len(parts) else ''
+        if not paragraph.strip():
+            humanized = paragraph
+        elif paragraph_cache is not None:
+            humanized = paragraph_cache.get_or_compute('paragraph', paragraph, humanize_paragraph)
+        else:
+            humanized = humanize_paragraph(paragraph)
+        yield index, humanized, separator
 
 def detect_ai_indicators(text):
-    """Detect AI-generated text indicators"""
+    """Detect AI-generated text indicators (text may be a string or an AnalyzedText)"""
+    doc = analyze(text)
     indicators = []
     confidence = 0
+    vocabulary_diversity = doc.unique_token_count / doc.word_count if doc.word_count else 0
     
     # Check for repetitive patterns
-    if len(set(text.split())) / len(text.split()) < 0.3:
+    if doc.word_count and vocabulary_diversity < 0.3:
         indicators.append("Low vocabulary diversity")
         confidence += 20
     
+    # Formal and jargon phrases, found in one pass over the words
+    phrases = AI_PHRASE_MATCHER.distinct_matches(doc.words)
+
     # Check for formal/robotic language
-    formal_words = ['furthermore', 'moreover', 'consequently', 'thus', 'therefore']
-    formal_count = sum(1 for word in formal_words if word.lower() in text.lower())
+    formal_count = len(phrases['formal'])
     if formal_count > 2:
         indicators.append("Excessive formal language")
         confidence += 15
     
     # Check for repetitive sentence structures
-    sentences = re.split(r'[.!?]+', text)
-    if len(sentences) > 3:
-        avg_length = sum(len(s.split()) for s in sentences) / len(sentences)
+    avg_length = 0
+    if doc.sentence_count > 3:
+        avg_length = doc.word_count / doc.sentence_count
         if avg_length > 25:
             indicators.append("Long, complex sentences")
             confidence += 10
     
     # Check for technical jargon
-    jargon_words = ['implementation', 'methodology', 'framework', 'optimization', 'algorithm']
-    jargon_count = sum(1 for word in jargon_words if word.lower() in text.lower())
+    jargon_count = len(phrases['jargon'])
     if jargon_count > 1:
         indicators.append("Technical jargon")
         confidence += 10
@@ -106,61 +239,143 @@ def detect_ai_indicators(text):
         'confidence': min(confidence, 100),
         'indicators': indicators,
         'analysis': {
-            'vocabulary_diversity': len(set(text.split())) / len(text.split()) if text.split() else 0,
+            'vocabulary_diversity': vocabulary_diversity,
             'formal_word_count': formal_count,
             'jargon_count': jargon_count,
-            'avg_sentence_length': avg_length if len(sentences) > 3 else 0
+            'avg_sentence_length': avg_length
         }
     }
 
+class ConsoleObserver:
+    """Prints pipeline progress to the console (used by the CLI and interactive mode)"""
+
+    def on_start(self, text):
+        print("\n" + "="*60)
+        print("🤖 AI HUMANISER - COMPREHENSIVE PROCESSING")
+        print("="*60)
+
+    def on_stage(self, name, context):
+        if name == 'humanize':
+            self.on_humanized(context.original_text, context.values['humanized_text'])
+        elif name == 'numbers':
+            self.on_numbers_formatted(context.values['final_text'])
+
+    def on_humanized(self, text, humanized_text):
+        print("\n📝 Step 1: Text Humanization")
+        print("-" * 40)
+        print(f"Original: {text[:100]}{'...' if len(text) > 100 else ''}")
+        print(f"Humanized: {humanized_text[:100]}{'...' if len(humanized_text) > 100 else ''}")
+
+    def on_numbers_formatted(self, final_text):
+        print("\n🔢 Step 2: Number Formatting")
+        print("-" * 40)
+        print(f"With Numbers: {final_text[:100]}{'...' if len(final_text) > 100 else ''}")
+
+    def on_detection(self, ai_result):
+        print("\n🔍 Step 3: AI Detection Analysis")
+        print("-" * 40)
+        print(f"AI Generated: {ai_result['is_ai_generated']}")
+        print(f"Confidence: {ai_result['confidence']}%")
+        if ai_result['indicators']:
+            print("Indicators:")
+            for indicator in ai_result['indicators']:
+                print(f"  • {indicator}")
+
+    def on_complete(self, result):
+        if 'ai_detection' in result:
+            self.on_detection(result['ai_detection'])
+        text = result['original_text']
+        final_text = result['final_text']
+        print("\n📊 Processing Summary")
+        print("-" * 40)
+        print(f"Processing Time: {result['processing_time']:.3f} seconds")
+        print(f"Original Length: {len(text)} characters")
+        print(f"Final Length: {len(final_text)} characters")
+        print(f"Changes Made: {'Significant' if text != final_text else 'Minor'}")
+
+def humanize_stage(context):
+    """Pipeline stage: text humanization (incremental when a sentence_cache is given)"""
+    sentence_cache = context.options.get('sentence_cache')
+    if sentence_cache is not None:
+        humanized_text, context.values['incremental'] = humanize_text_incremental(context.doc, sentence_cache)
+        return humanized_text
+    return humanize_text(context.text)
+
+def detect_stage(context):
+    """Pipeline stage: AI detection on the original text"""
+    return detect_ai_indicators(context.doc)
+
+def diff_stage(context):
+    """Pipeline stage: word-level changes between the original and the final text"""
+    original_words = context.doc.tokens
+    final_words = context.text.split()
+    matcher = difflib.SequenceMatcher(None, original_words, final_words, autojunk=False)
+    return [
+        {'original': ' '.join(original_words[i1:i2]), 'humanized': ' '.join(final_words[j1:j2])}
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != 'equal'
+    ]
+
+TEXT_PIPELINE = Pipeline([
+    # Nothing to humanize in blank text
+    Stage('humanize', humanize_stage, output='humanized_text',
+          skip_if=lambda context: not context.text.strip()),
+    # Nothing to format if the input has no digits
+    Stage('numbers', lambda context: humanize_numbers_in_text(context.text), output='final_text',
+          skip_if=lambda context: not context.doc.has_digits),
+    # Computed only when read from the result
+    Stage('detect', detect_stage, output='ai_detection', transforms=False, lazy=True),
+    Stage('diff', diff_stage, output='diff', transforms=False, lazy=True,
+          skip_if=lambda context: context.text == context.original_text),
+])
+
+def run_pipeline(text, observer=None, sentence_cache=None, skip=(), only=None):
+    """Process text with humanization, number formatting and AI detection.
+
+    Produces no console output; pass an observer (e.g. ConsoleObserver) to
+    follow the individual steps. Stages ('humanize', 'numbers', 'detect',
+    'diff') can be left out with skip or chosen with only. AI detection
+    ('ai_detection') and the word diff ('diff') are computed only when read
+    from the returned PipelineResult. When a sentence_cache is given, only
+    new or edited sentences are humanized (see humanize_text_incremental).
+    """
+    return TEXT_PIPELINE.run(text, observer=observer, skip=skip, only=only, sentence_cache=sentence_cache)
+
 def process_text_comprehensive(text):
-    """Process text with both humanization and number formatting"""
-    print("\n" + "="*60)
-    print("🤖 AI HUMANISER - COMPREHENSIVE PROCESSING")
-    print("="*60)
-    
+    """Process text with both humanization and number formatting, printing each step"""
+    return run_pipeline(text, observer=ConsoleObserver())
+
+def warm_up():
+    """Load WordNet and TextBlob resources up front and exercise the pipeline once.
+
+    WordNet otherwise loads lazily on the first lookups, making the first
+    requests after a (re)start slow. Call this before forking worker
+    processes so they share the loaded corpora copy-on-write. Returns the
+    warm-up time in seconds.
+    """
     start_time = time.time()
-    
-    # Step 1: Text Humanization
-    print("\n📝 Step 1: Text Humanization")
-    print("-" * 40)
-    humanized_text = humanize_text(text)
-    print(f"Original: {text[:100]}{'...' if len(text) > 100 else ''}")
-    print(f"Humanized: {humanized_text[:100]}{'...' if len(humanized_text) > 100 else ''}")
-    
-    # Step 2: Number Formatting
-    print("\n🔢 Step 2: Number Formatting")
-    print("-" * 40)
-    final_text = humanize_numbers_in_text(humanized_text)
-    print(f"With Numbers: {final_text[:100]}{'...' if len(final_text) > 100 else ''}")
-    
-    # Step 3: AI Detection
-    print("\n🔍 Step 3: AI Detection Analysis")
-    print("-" * 40)
-    ai_result = detect_ai_indicators(text)
-    print(f"AI Generated: {ai_result['is_ai_generated']}")
-    print(f"Confidence: {ai_result['confidence']}%")
-    if ai_result['indicators']:
-        print("Indicators:")
-        for indicator in ai_result['indicators']:
-            print(f"  • {indicator}")
-    
-    processing_time = time.time() - start_time
-    
-    print("\n📊 Processing Summary")
-    print("-" * 40)
-    print(f"Processing Time: {processing_time:.3f} seconds")
-    print(f"Original Length: {len(text)} characters")
-    print(f"Final Length: {len(final_text)} characters")
-    print(f"Changes Made: {'Significant' if text != final_text else 'Minor'}")
-    
-    return {
-        'original_text': text,
-        'humanized_text': humanized_text,
-        'final_text': final_text,
-        'ai_detection': ai_result,
-        'processing_time': processing_time
-    }
+
+    if isinstance(wordnet, IndexedWordNet):
+        # Fault the memory-mapped synonym index in
+        wordnet.index.preload()
+    else:
+        # Lemma index, then every synset into the reader's offset cache
+        wordnet.ensure_loaded()
+        for _ in wordnet.all_synsets():
+            pass
+
+    # TextBlob tokenizer and tagger
+    TextBlob("Warm up the tokenizer and the tagger.").tags
+
+    run_pipeline(
+        "The implementation methodology demonstrates comprehensive functionality. "
+        "Furthermore, it requires 500000 INR and 15000000 bytes."
+    )['ai_detection']
+
+    # Keep the loaded objects out of future GC passes, which would otherwise
+    # touch (and un-share) their pages in forked workers
+    gc.freeze()
+    return time.time() - start_time
 
 def interactive_mode():
     """Run the model in interactive mode"""
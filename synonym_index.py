@@ -0,0 +1,291 @@
+"""
+Synonym Index
+Precompiled, memory-mapped WordNet synonym table for fast replace_word lookups
+
+Usage:
+  python synonym_index.py build [output]        # Compile the index from the NLTK WordNet corpus
+  python synonym_index.py lookup <word> [pos]   # Show the synsets stored for a word
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+SYNONYM_INDEX_PATH = os.environ.get("AI_SYNONYM_INDEX", "synonym_index.bin")
+
+MAGIC = b'AHSYNIDX'
+FORMAT_VERSION = 1
+# magic, format version, slot count, entry count
+HEADER = struct.Struct('<8sIII')
+SLOT = struct.Struct('<I')
+
+# WordNet parts of speech, in the order wordnet.synsets() searches them
+POS_LIST = ('n', 'v', 'a', 'r')
+
+# WordNet's suffix detachment rules (as used by nltk's morphy)
+MORPHOLOGICAL_SUBSTITUTIONS = {
+    'n': [('s', ''), ('ses', 's'), ('ves', 'f'), ('xes', 'x'), ('zes', 'z'),
+          ('ches', 'ch'), ('shes', 'sh'), ('men', 'man'), ('ies', 'y')],
+    'v': [('s', ''), ('ies', 'y'), ('es', 'e'), ('es', ''), ('ed', 'e'),
+          ('ed', ''), ('ing', 'e'), ('ing', '')],
+    'a': [('er', ''), ('est', ''), ('er', 'e'), ('est', 'e')],
+    'r': [],
+}
+
+def _lemma_key(lemma, pos):
+    return f"l\t{pos}\t{lemma}".encode('utf-8')
+
+def _exception_key(form, pos):
+    return f"x\t{pos}\t{form}".encode('utf-8')
+
+def _slot_for(key, slot_count):
+    return zlib.crc32(key) & (slot_count - 1)
+
+def build_index(output_path=SYNONYM_INDEX_PATH):
+    """Compile the synonym index from the NLTK WordNet corpus.
+
+    The output only depends on the installed WordNet data, so rebuilding
+    from the same corpus produces a byte-identical file. Returns the number
+    of entries written.
+    """
+    from nltk.corpus import wordnet
+
+    wordnet.ensure_loaded()
+    entries = {}
+    for pos in POS_LIST:
+        for lemma in sorted(wordnet.all_lemma_names(pos)):
+            offsets = wordnet._lemma_pos_offset_map[lemma].get(pos, [])
+            synsets = [wordnet.synset_from_pos_and_offset(pos, offset) for offset in offsets]
+            entries[_lemma_key(lemma, pos)] = '|'.join(
+                f"{synset.name()};{','.join(synset.lemma_names())}" for synset in synsets
+            ).encode('utf-8')
+        for form, bases in sorted(wordnet._exception_map[pos].items()):
+            entries[_exception_key(form, pos)] = ','.join(bases).encode('utf-8')
+
+    # Open addressing with linear probing, at most half full
+    slot_count = 1
+    while slot_count < len(entries) * 2:
+        slot_count *= 2
+    slots = [0] * slot_count
+    data = bytearray()
+
+    for key in sorted(entries):
+        slot = _slot_for(key, slot_count)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = len(data) + 1
+        data += key + b'\t' + entries[key] + b'\n'
+
+    with open(output_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, slot_count, len(entries)))
+        f.write(struct.pack(f'<{slot_count}I', *slots))
+        f.write(data)
+    return len(entries)
+
+class SynonymIndex:
+    """Read-only, memory-mapped view of a compiled synonym index"""
+
+    def __init__(self, path=SYNONYM_INDEX_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.slot_count, self.entry_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a synonym index (format {FORMAT_VERSION})")
+        self._data_start = HEADER.size + self.slot_count * SLOT.size
+
+    def _get(self, key):
+        slot = _slot_for(key, self.slot_count)
+        while True:
+            offset = SLOT.unpack_from(self._map, HEADER.size + slot * SLOT.size)[0]
+            if not offset:
+                return None
+            start = self._data_start + offset - 1
+            end = start + len(key)
+            if self._map[start:end] == key and self._map[end:end + 1] == b'\t':
+                return self._map[end + 1:self._map.find(b'\n', end)].decode('utf-8')
+            slot = (slot + 1) & (self.slot_count - 1)
+
+    def lookup(self, lemma, pos):
+        """Return [(synset_name, [lemma_names])] for an exact lemma, or None if it is not in WordNet"""
+        value = self._get(_lemma_key(lemma, pos))
+        if value is None:
+            return None
+        synsets = []
+        for item in value.split('|') if value else ():
+            name, lemma_names = item.split(';', 1)
+            synsets.append((name, lemma_names.split(',')))
+        return synsets
+
+    def base_forms(self, form, pos):
+        """Return the lemmas for an inflected form, following WordNet's morphy rules"""
+        exceptions = self._get(_exception_key(form, pos))
+        if exceptions is not None:
+            return self._existing([form] + exceptions.split(','), pos)
+
+        substitutions = MORPHOLOGICAL_SUBSTITUTIONS[pos]
+
+        def apply_rules(forms):
+            return [f[:-len(old)] + new for f in forms for old, new in substitutions if f.endswith(old)]
+
+        forms = apply_rules([form])
+        results = self._existing([form] + forms, pos)
+        while not results and forms:
+            forms = apply_rules(forms)
+            results = self._existing(forms, pos)
+        return results
+
+    def _existing(self, forms, pos):
+        results = []
+        for form in forms:
+            if form not in results and self._get(_lemma_key(form, pos)) is not None:
+                results.append(form)
+        return results
+
+    def preload(self):
+        """Fault every page of the index into memory"""
+        if hasattr(mmap, 'MADV_WILLNEED'):
+            self._map.madvise(mmap.MADV_WILLNEED)
+        for position in range(0, len(self._map), mmap.PAGESIZE):
+            self._map[position]
+
+class IndexedLemma:
+    """
+    Stand-in for nltk's Lemma carrying its name and synset. Anything else
+    (antonyms(), count(), ...) is loaded from WordNet on first use.
+    """
+
+    def __init__(self, name, synset):
+        self._name = name
+        self._synset = synset
+        self._lemma = None
+
+    def name(self):
+        return self._name
+
+    def synset(self):
+        return self._synset
+
+    def _full(self):
+        if self._lemma is None:
+            self._lemma = self._synset._wordnet.lemma(f"{self._synset.name()}.{self._name}")
+        return self._lemma
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._full(), name)
+
+    def __repr__(self):
+        return f"Lemma('{self._synset.name()}.{self._name}')"
+
+class IndexedSynset:
+    """
+    Stand-in for nltk's Synset carrying the data replace_word needs
+    (name, part of speech and lemma names). Anything else is loaded from
+    WordNet on first use.
+    """
+
+    def __init__(self, name, lemma_names, wordnet):
+        self._name = name
+        self._lemma_names = lemma_names
+        self._wordnet = wordnet
+        self._synset = None
+
+    def name(self):
+        return self._name
+
+    def pos(self):
+        return self._name.split('.')[-2]
+
+    def lemma_names(self, lang='eng'):
+        if lang != 'eng':
+            return self._full().lemma_names(lang)
+        return list(self._lemma_names)
+
+    def lemmas(self, lang='eng'):
+        if lang != 'eng':
+            return self._full().lemmas(lang)
+        return [IndexedLemma(name, self) for name in self._lemma_names]
+
+    def _full(self):
+        if self._synset is None:
+            self._synset = self._wordnet.synset(self._name)
+        return self._synset
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._full(), name)
+
+    def __eq__(self, other):
+        return self._name == getattr(other, 'name', lambda: None)()
+
+    def __hash__(self):
+        return hash(self._name)
+
+    def __repr__(self):
+        return f"Synset('{self._name}')"
+
+class IndexedWordNet:
+    """
+    Drop-in replacement for the nltk wordnet object that answers synsets()
+    from the synonym index and delegates everything else to WordNet.
+    """
+
+    def __init__(self, index, wordnet):
+        self.index = index
+        self._wordnet = wordnet
+
+    def synsets(self, lemma, pos=None, lang='eng', check_exceptions=True):
+        if lang != 'eng' or not check_exceptions:
+            return self._wordnet.synsets(lemma, pos, lang, check_exceptions)
+
+        lemma = lemma.lower()
+        result = []
+        for p in pos or POS_LIST:
+            p = 'a' if p == 's' else p
+            for form in self.index.base_forms(lemma, p):
+                for name, lemma_names in self.index.lookup(form, p):
+                    result.append(IndexedSynset(name, lemma_names, self._wordnet))
+        return result
+
+    def ensure_loaded(self):
+        self.index.preload()
+
+    def __getattr__(self, name):
+        return getattr(self._wordnet, name)
+
+def install_synonym_index(module, path=SYNONYM_INDEX_PATH):
+    """Replace module.wordnet with an index-backed WordNet if a compiled index exists.
+
+    Returns the IndexedWordNet, or None if there is no index at path.
+    """
+    if not os.path.exists(path):
+        return None
+    indexed = IndexedWordNet(SynonymIndex(path), module.wordnet)
+    module.wordnet = indexed
+    return indexed
+
+def main():
+    """Main function"""
+    if len(sys.argv) > 1 and sys.argv[1] == 'build':
+        output_path = sys.argv[2] if len(sys.argv) > 2 else SYNONYM_INDEX_PATH
+        count = build_index(output_path)
+        print(f"✅ Wrote {count} entries to {output_path}")
+    elif len(sys.argv) > 2 and sys.argv[1] == 'lookup':
+        index = SynonymIndex()
+        word = sys.argv[2].lower()
+        for pos in (sys.argv[3],) if len(sys.argv) > 3 else POS_LIST:
+            for form in index.base_forms(word, pos):
+                for name, lemma_names in index.lookup(form, pos):
+                    print(f"{name}: {', '.join(lemma_names)}")
+    else:
+        print("Usage:")
+        print("  python synonym_index.py build [output]        # Compile the index")
+        print("  python synonym_index.py lookup <word> [pos]   # Show stored synsets")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Text Analysis
+Single-pass tokenization shared by humanization, number formatting and detection
+"""
+
+import re
+from functools import cached_property
+
+# Sentence boundaries: the whitespace following terminal punctuation
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])(\s+)')
+DIGIT = re.compile(r'\d')
+# Paragraph boundaries: blank lines, possibly containing other whitespace
+PARAGRAPH_BOUNDARY = re.compile(r'(\n[ \t\r\f\v]*\n\s*)')
+# Words are runs of letters/digits, optionally joined by apostrophes
+WORD = re.compile(r"\w+(?:['’]\w+)*")
+
+def split_sentences(text):
+    """Split text into sentences, keeping the separating whitespace.
+
+    Sentences are at even indexes and separators at odd indexes, so
+    ''.join(parts) reproduces the original text exactly.
+    """
+    return SENTENCE_BOUNDARY.split(text)
+
+def split_paragraphs(text):
+    """Split text into paragraphs, keeping the separating blank lines.
+
+    Paragraphs are at even indexes and separators at odd indexes, like
+    split_sentences.
+    """
+    return PARAGRAPH_BOUNDARY.split(text)
+
+def tokenize_words(text):
+    """Split text into words, dropping punctuation"""
+    return WORD.findall(text)
+
+class AnalyzedText:
+    """
+    A document that is sentence-split and tokenized once.
+
+    Every pipeline step reads the pieces it needs from here instead of
+    re-splitting or re-lowercasing the text itself. Derived views such as the
+    lowercased text are computed on first access only.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.sentence_parts = split_sentences(text)
+        self.tokens = []
+        self.sentence_lengths = []
+
+        for sentence in self.sentence_parts[::2]:
+            words = sentence.split()
+            if words:
+                self.tokens.extend(words)
+                self.sentence_lengths.append(len(words))
+
+    @property
+    def word_count(self):
+        return len(self.tokens)
+
+    @property
+    def sentence_count(self):
+        return len(self.sentence_lengths)
+
+    @cached_property
+    def lower(self):
+        """The lowercased text"""
+        return self.text.lower()
+
+    @cached_property
+    def words(self):
+        """Lowercased words with punctuation stripped, for lexicon matching"""
+        return tokenize_words(self.lower)
+
+    @cached_property
+    def unique_token_count(self):
+        return len(set(self.tokens))
+
+    @cached_property
+    def has_digits(self):
+        """Whether the text contains any digit (number formatting can be skipped otherwise)"""
+        return DIGIT.search(self.text) is not None
+
+def analyze(text):
+    """Return an AnalyzedText for text, reusing it if it is already analyzed"""
+    return text if isinstance(text, AnalyzedText) else AnalyzedText(text)